@@ -1,175 +1,160 @@
-import os
-import json
-import base64
-import datetime
 import pandas as pd
 import streamlit as st
-from urllib.parse import quote
-from io import BytesIO
-import re
 import altair as alt
+from shopee_har.aggregates import Aggregates, group_totals, top_n
+from shopee_har.archive import UPLOAD_HELP, UPLOAD_TYPES
+from shopee_har.cluster import cluster_frame, cluster_totals
+from shopee_har.columns import concat_frames, drop_duplicate_items
+from shopee_har.decode import active_backend
+from shopee_har.layouts import EXTRACT_COLUMNS
+from shopee_har.metrics import log_metrics
+from shopee_har.paging import PAGE_SIZES, page_count, page_frame
+from shopee_har.store import dataset_key, result_frames, shared_store
+from shopee_har.ui import (
+    cancel_extraction_job,
+    export_buttons,
+    get_extraction_job,
+    get_result_cache,
+    get_search_index,
+    get_sort_order,
+    rerun_until_done,
+    show_debug_panel,
+    show_job_status,
+)
 
-def trim_name(name):
-    return " ".join(name.split()) if isinstance(name, str) else name
+# Data grafik per (data, filter, grup, N); tanpa filter diambil dari agregat inkremental
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_chart_data(_aggregates, _frame, data_key, filter_key, dimension, top, _rows):
+    totals = _aggregates.totals[dimension] if _rows is None else group_totals(_frame, dimension, _rows)
+    return top_n(totals, top)
 
-def find_nested_value(data, path, default="N/A"):
-    keys = path.split(".")
-    for key in keys:
-        if isinstance(data, dict) and key in data:
-            data = data[key]
-        elif isinstance(data, list) and key.isdigit() and len(data) > int(key):
-            data = data[int(key)]
-        else:
-            return default
-    return data
+# Dataset gabungan disimpan sekali per proses dan dipakai bersama semua sesi (hanya dibaca)
+def build_dataset(results, files):
+    frames = result_frames(results, get_result_cache(), files)
+    if not frames:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+    full_df = drop_duplicate_items(concat_frames(frames))
+    full_df["total_revenue"] = full_df["sold_30_days"] * full_df["price"]
+    return full_df
 
-def find_value(data, keys, default="N/A"):
-    if isinstance(data, dict):
-        for key in keys:
-            if key in data:
-                return data[key]
-        for v in data.values():
-            result = find_value(v, keys, default)
-            if result != default:
-                return result
-    elif isinstance(data, list):
-        for item in data:
-            result = find_value(item, keys, default)
-            if result != default:
-                return result
-    return default
+# Selama ekstraksi berjalan agregat milik sesi ini diperbarui per file baru;
+# setelah selesai agregat dipindahkan ke penyimpanan bersama dan tidak diubah lagi
+def build_aggregates(results, files):
+    aggregates = st.session_state.pop("aggregates", None)
+    if aggregates is None or not set(aggregates.keys) <= {result.key for result in results}:
+        aggregates = Aggregates()
+    for result, file in zip(results, files):
+        if result.key not in aggregates.keys:
+            for frame in result_frames([result], get_result_cache(), [file]):
+                aggregates.add(frame, result.key)
+    return aggregates
 
-def create_shopee_url(base_url: str, name: str, shopid: str, itemid: str) -> str:
-    if not all([base_url, name, shopid, itemid]):
-        return ""
-    
-    name_cleaned = re.sub(r"[^a-zA-Z0-9\s-]", "", name)
-    name_cleaned = name_cleaned.strip().lower().replace(" ", "-")
-    name_cleaned = re.sub(r"-{2,}", "-", name_cleaned)
-    
-    return f"{base_url.rstrip('/')}/{quote(name_cleaned)}-i.{shopid}.{itemid}"
+TABLE_COLUMNS = EXTRACT_COLUMNS + ["total_revenue"]
+CHART_GROUPS = {"Shop Name": "shop_name", "Lokasi Toko": "shop_location", "Source": "source"}
 
-def ekstrak_dan_simpan_data(file):
-    data_list = []
-    try:
-        har_data = json.load(file)
-        for entry in har_data.get("log", {}).get("entries", []):
-            content = entry.get("response", {}).get("content", {})
-            text = content.get("text")
-            encoding = content.get("encoding")
-
-            if not text:
-                continue
-
-            try:
-                decoded_text = base64.b64decode(text).decode('utf-8') if encoding == "base64" else text
-                json_data = json.loads(decoded_text)
-            except Exception:
-                continue
-
-            item_lists = find_value(json_data, ["item_cards", "items", "item"], [])
-            if not isinstance(item_lists, list):
-                continue
-
-            for item in item_lists:
-                itemid = str(find_value(item, ["itemid"]))
-                shopid = str(find_value(item, ["shopid"]))
-                name = trim_name(find_nested_value(item, "item_card_displayed_asset.name"))
-                if name == "N/A":
-                    name = trim_name(find_nested_value(item, "item_basic.name"))
-                if name == "N/A":
-                    name = trim_name(find_nested_value(item, "name"))
-                price = find_value(item, ["price"], 0) / 100000
-                shop_name = find_value(item, ["shop_name"])
-                rating_star = round(find_value(item, ["rating_star"], 0), 1)
-                historical_sold = find_value(item, ["historical_sold_count", "historical_sold"], 0)
-                monthly_sold = find_value(item, ["monthly_sold_count", "sold"], 0)
-                rating_count = find_nested_value(item, "item_rating.rating_count", "N/A")
-                if isinstance(rating_count, list) and rating_count:
-                    rating_count = rating_count[0]
-                rating_count = int(rating_count) if str(rating_count).isdigit() else 0
-                ctime = find_value(item, ["ctime"])
-                ctime = datetime.datetime.fromtimestamp(ctime).strftime('%Y-%m-%d') if isinstance(ctime, (int, float)) else "N/A"
-                shopee_url = create_shopee_url("https://shopee.co.id/", name, shopid, itemid)
-                is_sold_out = str(find_value(item, ["is_sold_out"]))
-                data_list.append({
-                    "item_name": name,
-                    "price": price,
-                    "sold_30_days": monthly_sold,
-                    "historical_sold": historical_sold,
-                    "shopee_url": shopee_url,
-                    "shop_name": shop_name,
-                    "is_sold_out": is_sold_out,
-                    "itemid": itemid,
-                    "shopid": shopid,                    
-                    "upload_date": ctime,                    
-                    "rating_star": rating_star,
-                    "rating_count": rating_count,
-                })
-    except Exception as e:
-        st.error(f"Error processing file: {e}")
-    return pd.DataFrame(data_list) if data_list else None
-    
 st.set_page_config(layout="wide", page_title="Naufal - Scrape Shopee")
 st.title("Extract Data Shopee")
 
-uploaded_files = st.file_uploader("Upload HAR files", type=["har"], accept_multiple_files=True)
+uploaded_files = st.file_uploader("Upload HAR files", type=UPLOAD_TYPES, accept_multiple_files=True, help=UPLOAD_HELP)
+backend = active_backend()
+st.caption(f"Decoder: {backend.json} (JSON), {backend.base64} (base64)")
 
 if uploaded_files:
-    all_dataframes = [ekstrak_dan_simpan_data(file) for file in uploaded_files]
-    all_dataframes = [df for df in all_dataframes if df is not None]
+    job = get_extraction_job(uploaded_files)
+    # Hasil yang sudah selesai langsung ditampilkan; halaman diperbarui tiap ada file baru yang selesai
+    results, metrics, progress = show_job_status(job)
 
-    if all_dataframes:
-        final_df = pd.concat(all_dataframes, ignore_index=True)
+    if progress["rows"]:
+        # Kunci dataset = hash isi semua file, jadi sesi lain dengan file yang sama memakai data yang sama
+        data_key = dataset_key(results, "extract")
+        store = shared_store()
+        # Produk yang sama dari beberapa halaman/file cukup diambil sekali (data terbaru).
+        # Hasil sementara (ekstraksi belum selesai) tidak masuk penyimpanan bersama
+        with metrics.stage("dedup"):
+            final_df = store.get_or_build(("extract", data_key), lambda: build_dataset(results, job.files)) if job.done else build_dataset(results, job.files)
+        with metrics.stage("aggregate"):
+            if job.done:
+                aggregates = store.get_or_build(("aggregates", data_key), lambda: build_aggregates(results, job.files))
+            else:
+                aggregates = st.session_state["aggregates"] = build_aggregates(results, job.files)
+        if job.done and not job.released:
+            # Frame per file tidak perlu disimpan per sesi lagi; dibaca ulang dari cache disk (atau diekstrak ulang)
+            job.release_frames(get_result_cache())
         st.write("### Data Extracted")
         
         if not final_df.empty:
-            final_df['total_revenue'] = final_df['sold_30_days'] * final_df['price']
-            bar_chart_data = final_df.groupby('shop_name')['total_revenue'].sum().reset_index()
-            bar_chart_data = bar_chart_data.sort_values(by='total_revenue', ascending=False)
-            base = alt.Chart(bar_chart_data).encode(
-                x=alt.X('total_revenue:Q', title='Total Revenue'),
-                y=alt.Y('shop_name:N', sort='-x', title='Shop Name')
-            )
+            # Grafik diisi setelah filter dibaca, tetapi tetap tampil di atas tabel
+            chart_area = st.container()
             
-            bars = base.mark_bar().encode(
-                tooltip=['shop_name', 'total_revenue']
-            )
+            search_index = get_search_index(final_df, data_key)
+            col1, col2 = st.columns(2)
+            with col1:
+                item_query = st.text_input("Cari Item Name", placeholder="mis. kaos polos")
+            with col2:
+                shop_query = st.text_input("Cari Shop Name")
             
-            text = base.mark_text(
-                align='left',
-                baseline='middle',
-                dx=3,  # Jarak horizontal dari batang
-                color='#1f77b4',
-                fontWeight='bold'
-            ).encode(
-                text=alt.Text('total_revenue:Q', format=',.0f')  # Format ribuan
-            )
+            # Filter menghasilkan nomor baris, bukan salinan data
+            with metrics.stage("search"):
+                rows = search_index.filter_rows({"item_name": item_query, "shop_name": shop_query})
+            total_rows = len(final_df) if rows is None else len(rows)
             
-            chart = (bars + text).properties(
-                width='container',
-                height=600,
-                title='Total Revenue Shopee Last 30 Days'
-            ).interactive()
+            st.write(f"Total Data: {total_rows} Baris")
             
-            st.altair_chart(chart, use_container_width=True)
+            with chart_area:
+                col1, col2 = st.columns(2)
+                with col1:
+                    group_label = st.selectbox("Grafik per", list(CHART_GROUPS))
+                with col2:
+                    top = st.slider("Jumlah Grup Teratas", min_value=5, max_value=100, value=20, step=5)
+                dimension = CHART_GROUPS[group_label]
+                with metrics.stage("chart"):
+                    # Hanya N grup teratas + satu batang "Lainnya", berapa pun jumlah barisnya
+                    bar_chart_data = get_chart_data(aggregates, final_df, data_key, (item_query, shop_query), dimension, top, rows)
+                    base = alt.Chart(bar_chart_data).encode(
+                        x=alt.X('total_revenue:Q', title='Total Revenue'),
+                        y=alt.Y(f'{dimension}:N', sort=None, title=group_label)
+                    )
+                
+                    bars = base.mark_bar().encode(
+                        tooltip=[dimension, alt.Tooltip('total_revenue:Q', format=',.0f'), 'sold_30_days', 'items']
+                    )
+                
+                    text = base.mark_text(
+                        align='left',
+                        baseline='middle',
+                        dx=3,  # Jarak horizontal dari batang
+                        color='#1f77b4',
+                        fontWeight='bold'
+                    ).encode(
+                        text=alt.Text('total_revenue:Q', format=',.0f')  # Format ribuan
+                    )
+                
+                    chart = (bars + text).properties(
+                        width='container',
+                        height=max(200, 24 * len(bar_chart_data)),
+                        title='Total Revenue Shopee Last 30 Days'
+                    ).interactive()
+                
+                    st.altair_chart(chart, use_container_width=True)
             
-            col1, col2 = st.columns(2)
+            col1, col2, col3, col4 = st.columns(4)
             with col1:
-                item_name_filter = st.multiselect("Filter Item Name", options=sorted(final_df['item_name'].unique().tolist()), default=None)
+                sort_column = st.selectbox("Urutkan Berdasarkan", ["(urutan asli)"] + TABLE_COLUMNS)
             with col2:
-                shop_name_filter = st.multiselect("Filter Shop Name", options=sorted(final_df['shop_name'].unique().tolist()), default=None)
-            
-            filtered_df = final_df.copy()
-            if item_name_filter:
-                filtered_df = filtered_df[filtered_df['item_name'].isin(item_name_filter)]
-            if shop_name_filter:
-                filtered_df = filtered_df[filtered_df['shop_name'].isin(shop_name_filter)]
-            
-            st.write(f"Total Data: {len(filtered_df)} Baris")
+                ascending = st.selectbox("Arah", ["Naik", "Turun"]) == "Naik"
+            with col3:
+                page_size = st.selectbox("Baris per Halaman", PAGE_SIZES)
+            with col4:
+                page_number = st.number_input("Halaman", min_value=1, max_value=page_count(total_rows, page_size), value=1)
             
+            # Hanya baris di halaman yang tampil yang dikirim ke browser
+            with metrics.stage("sort_page"):
+                order = rows
+                if sort_column != "(urutan asli)":
+                    order = get_sort_order(final_df, data_key, (item_query, shop_query), sort_column, ascending, rows)
+                page = page_frame(final_df, page_number, page_size, order)[TABLE_COLUMNS]
             st.data_editor(
-                filtered_df,
+                page,
                 use_container_width=True,
                 column_config={
                     "shopee_url": st.column_config.LinkColumn(
@@ -178,10 +163,21 @@ if uploaded_files:
                 }
             )
             
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                final_df.to_excel(writer, index=False, sheet_name="Shopee Data")
-            output.seek(0)
-            st.download_button("Download Excel", output, "shopee_data.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    else:
+            # File unduhan hanya dibuat saat diminta, lalu di-cache berdasarkan isi data
+            export_key = data_key if rows is None else f"{data_key}:{(item_query, shop_query)}"
+            export_buttons(final_df, export_key, rows, TABLE_COLUMNS, metrics=metrics)
+
+            # Produk yang sama dijual banyak toko dengan nama sedikit berbeda; dikelompokkan sekali per dataset
+            if job.done and st.checkbox("Tampilkan Produk Serupa Antar Toko"):
+                with metrics.stage("cluster"), st.spinner("Mengelompokkan produk serupa..."):
+                    clusters = store.get_or_build(("clusters", data_key), lambda: cluster_totals(cluster_frame(final_df)))
+                st.dataframe(clusters[clusters["shops"] > 1].head(100), use_container_width=True, hide_index=True)
+    elif job.done:
         st.warning("No valid data extracted from the uploaded files.")
+
+    if job.done:
+        log_metrics("ui_run", metrics, files=len(results), rows=progress["rows"])
+    show_debug_panel(metrics, results)
+    rerun_until_done(job, len(results))
+else:
+    cancel_extraction_job()
@@ -0,0 +1,65 @@
+from .reader import iter_har_entries
+from .aggregates import Aggregates
+from .archive import ArchiveMember, expand_archives
+from .background import ExtractionJob
+from .cluster import cluster_frame, cluster_labels, cluster_totals
+from .endpoints import (
+    ENDPOINTS,
+    Endpoint,
+    locate_items,
+    match_endpoint,
+    register_endpoint,
+    unregister_endpoint,
+)
+from .decode import active_backend, select_backend
+from .extract import decode_body, extract_entries, extract_frame, extract_har
+from .fields import create_shopee_url, find_nested_value, find_value, trim_name
+from .history import SnapshotStore
+from .layouts import ekstrak_dan_simpan_data, process_har_files
+from .metrics import Metrics, collect_metrics
+from .parallel import FileResult, extract_files, extract_har_parallel, iter_extract_files
+from .shapes import SHAPE_STATS, detect_shape, iter_item_fields
+from .spill import PartitionStore
+from .store import DatasetStore, shared_store
+
+__all__ = [
+    "Aggregates",
+    "ArchiveMember",
+    "DatasetStore",
+    "ENDPOINTS",
+    "Endpoint",
+    "ExtractionJob",
+    "FileResult",
+    "Metrics",
+    "PartitionStore",
+    "SHAPE_STATS",
+    "SnapshotStore",
+    "active_backend",
+    "cluster_frame",
+    "cluster_labels",
+    "cluster_totals",
+    "collect_metrics",
+    "create_shopee_url",
+    "decode_body",
+    "detect_shape",
+    "ekstrak_dan_simpan_data",
+    "expand_archives",
+    "extract_entries",
+    "extract_files",
+    "extract_frame",
+    "extract_har",
+    "extract_har_parallel",
+    "find_nested_value",
+    "find_value",
+    "iter_extract_files",
+    "iter_har_entries",
+    "iter_item_fields",
+    "locate_items",
+    "match_endpoint",
+    "process_har_files",
+    "register_endpoint",
+    "select_backend",
+    "shared_store",
+    "trim_name",
+    "unregister_endpoint",
+]
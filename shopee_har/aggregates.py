@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from .columns import ITEM_KEY
+
+DIMENSIONS = ("shop_name", "shop_location", "source")
+MEASURES = ["total_revenue", "sold_30_days", "items"]
+OTHERS = "Lainnya"
+
+
+def _measures(frame):
+    sold = frame["sold_30_days"].to_numpy(dtype=np.float64, na_value=0)
+    price = np.nan_to_num(frame["price"].to_numpy(dtype=np.float64, na_value=np.nan))
+    return pd.DataFrame({"total_revenue": sold * price, "sold_30_days": sold, "items": 1.0}, index=frame.index)
+
+
+def _empty_totals(dimension):
+    return pd.DataFrame({measure: pd.Series(dtype=np.float64) for measure in MEASURES}, index=pd.Index([], dtype=object, name=dimension))
+
+
+def group_totals(frame, dimension, rows=None):
+    """Revenue (sold_30_days * price), units sold and item count per ``dimension`` value.
+
+    ``rows`` restricts the totals to those positional rows, e.g. the result
+    of a search filter. Rows without a ``dimension`` value are left out.
+    """
+    if rows is not None:
+        frame = frame.iloc[rows]
+    values = _measures(frame)
+    values[dimension] = frame[dimension].astype(object)
+    return values.groupby(dimension, sort=False)[MEASURES].sum()
+
+
+def top_n(totals, n, by="total_revenue", others=OTHERS):
+    """The ``n`` largest groups by ``by``, plus one "others" row summing the rest.
+
+    Uses a partial selection (``argpartition``) so only the ``n`` selected
+    groups are sorted. Returns a frame with the group in the first column.
+    """
+    name = totals.index.name
+    if len(totals) > n:
+        values = totals[by].to_numpy()
+        top = np.argpartition(-values, n - 1)[:n] if n else np.array([], dtype=np.intp)
+        top = top[np.argsort(-values[top], kind="stable")]
+        rest = np.ones(len(totals), dtype=bool)
+        rest[top] = False
+        other = totals[rest].sum().to_frame(f"{others} ({rest.sum()})").T
+        totals = pd.concat([totals.iloc[top], other])
+    else:
+        totals = totals.sort_values(by, ascending=False, kind="stable")
+    totals.index.name = name
+    return totals.reset_index()
+
+
+class Aggregates:
+    """Per-shop, per-location and per-source totals, updated as frames are added.
+
+    Items are keyed by (shopid, itemid) the same way ``drop_duplicate_items``
+    does: a later capture of an item replaces its earlier contribution when
+    its ``last_update`` is at least as recent, so the totals of frames added
+    one by one equal ``group_totals`` over their de-duplicated concatenation.
+    Only the new frame and the groups it touches are processed per ``add``.
+    """
+
+    def __init__(self, dimensions=DIMENSIONS):
+        self.dimensions = tuple(dimensions)
+        self.totals = {dimension: _empty_totals(dimension) for dimension in self.dimensions}
+        self.keys = []
+        self.items = None
+
+    def add(self, frame, key=None):
+        """Add one frame; a frame whose ``key`` was already added is skipped. Returns whether it was added."""
+        if key is not None:
+            if key in self.keys:
+                return False
+            self.keys.append(key)
+        rows = _measures(frame)
+        for dimension in self.dimensions:
+            rows[dimension] = frame[dimension].astype(object)
+        rows["last_update"] = frame["last_update"].fillna(pd.Timestamp.min)
+        keyed = (frame["shopid"].notna() & frame["itemid"].notna()).to_numpy()
+        self._apply(rows[~keyed], 1)
+
+        # Dalam satu frame cukup kemunculan terbaru (urutan asli dipakai jika waktunya sama)
+        new = rows[keyed].assign(shopid=frame["shopid"][keyed].astype("int64"), itemid=frame["itemid"][keyed].astype("int64"))
+        new = new.sort_values("last_update", kind="stable").drop_duplicates(ITEM_KEY, keep="last").set_index(ITEM_KEY)
+        if self.items is not None and len(self.items):
+            seen = new.index.isin(self.items.index)
+            old = self.items.loc[new.index[seen]]
+            newer = new["last_update"].to_numpy()[seen] >= old["last_update"].to_numpy()
+            replaced = old[newer]
+            self._apply(replaced, -1)
+            keep = ~seen
+            keep[np.flatnonzero(seen)[newer]] = True
+            new = new[keep]
+            self.items = pd.concat([self.items.drop(replaced.index), new])
+        else:
+            self.items = new
+        self._apply(new, 1)
+        return True
+
+    @property
+    def nbytes(self):
+        frames = list(self.totals.values()) + ([self.items] if self.items is not None else [])
+        return int(sum(frame.memory_usage(deep=True).sum() for frame in frames))
+
+    def _apply(self, rows, sign):
+        if not len(rows):
+            return
+        for dimension in self.dimensions:
+            change = rows.groupby(dimension, sort=False)[MEASURES].sum()
+            totals = self.totals[dimension].add(change * sign, fill_value=0)
+            # Grup yang semua itemnya sudah diganti ke grup lain dibuang
+            self.totals[dimension] = totals[totals["items"] > 0]
@@ -0,0 +1,367 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .archive import expand_archives
+from .cache import DEFAULT_CACHE_DIR, ResultCache
+from .cli import expand_inputs
+from .columns import COLUMNS, concat_frames, drop_duplicate_items
+from .metrics import Metrics, collect_metrics, configure_metrics_log, count, log_metrics, timed
+from .paging import page_count, sort_rows
+from .parallel import default_workers, iter_extract_files
+from .search import SearchIndex, intersect_rows, normalize_text
+from .synthetic import parse_size, write_har
+
+DEFAULT_PORT = int(os.environ.get("SHOPEE_HAR_API_PORT", 8765))
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Kolom yang punya index terurut: filter sama-dengan dan rentang cukup dua binary search
+RANGE_COLUMNS = ("shopid", "itemid", "price", "last_update", "upload_date")
+
+
+class SortedColumn:
+    """Non-missing values of one column, sorted once, with their row positions."""
+
+    def __init__(self, values):
+        present = values.notna().to_numpy()
+        self.positions = np.flatnonzero(present)
+        self.values = values[present].to_numpy()
+        order = np.argsort(self.values, kind="stable")
+        self.values = self.values[order]
+        self.positions = self.positions[order]
+
+    def _bound(self, value):
+        if np.issubdtype(self.values.dtype, np.datetime64):
+            return pd.Timestamp(value).to_datetime64().astype(self.values.dtype)
+        return value
+
+    def between(self, low=None, high=None, include_high=True):
+        """Sorted row positions with ``low <= value <= high`` (``< high`` without include_high)."""
+        start = 0 if low is None else np.searchsorted(self.values, self._bound(low), "left")
+        end = len(self.values) if high is None else np.searchsorted(self.values, self._bound(high), "right" if include_high else "left")
+        return np.sort(self.positions[start:end])
+
+    def equal(self, values):
+        return np.unique(np.concatenate([self.between(value, value) for value in values]))
+
+
+class QueryIndex:
+    """Read-only lookups over one extracted dataset, built once.
+
+    shopid, itemid, price and the dates are kept as ``SortedColumn``; shop
+    names map (casefolded) to their rows; ``q`` uses the trigram
+    ``SearchIndex`` on item_name. Every filter resolves to sorted row
+    positions, and only the requested page is turned into JSON.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        # Kolom string arrow hasil concat terdiri dari banyak chunk dan lambat diambil per baris;
+        # array object cukup dibuat sekali untuk index yang hanya dibaca
+        strings = [column for column in self.frame.columns if pd.api.types.is_string_dtype(self.frame[column].dtype)
+                   and not isinstance(self.frame[column].dtype, pd.CategoricalDtype)]
+        self.frame = self.frame.astype({column: object for column in strings})
+        self.columns = [column for column in COLUMNS if column in self.frame.columns]
+        self.sorted = {column: SortedColumn(self.frame[column]) for column in RANGE_COLUMNS if column in self.frame.columns}
+        codes, uniques = pd.factorize(self.frame["shop_name"].astype(object).map(normalize_text))
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self.shop_names = {name: order[bounds[code]:bounds[code + 1]] for code, name in enumerate(uniques)}
+        self.search = SearchIndex(self.frame, ["item_name"])
+        self.built_at = pd.Timestamp.now().isoformat(timespec="seconds")
+
+    def __len__(self):
+        return len(self.frame)
+
+    def filter_rows(self, params):
+        """Sorted row positions matching the query parameters; None means no filter."""
+        row_sets = []
+        for column in ("shopid", "itemid"):
+            if column in params:
+                row_sets.append(self.sorted[column].equal([_parse_int(column, value) for value in _split(params[column])]))
+        if "shop_name" in params:
+            names = [normalize_text(name) for name in _split(params["shop_name"])]
+            empty = np.empty(0, dtype=np.int64)
+            row_sets.append(np.unique(np.concatenate([self.shop_names.get(name, empty) for name in names])))
+        if "min_price" in params or "max_price" in params:
+            row_sets.append(self.sorted["price"].between(_parse_float(params, "min_price"), _parse_float(params, "max_price")))
+        for column, prefix in (("last_update", "date"), ("upload_date", "upload_date")):
+            low, high = _parse_dates(params, prefix)
+            if low is not None or high is not None:
+                row_sets.append(self.sorted[column].between(low, high, include_high=False))
+        if params.get("q", "").strip():
+            row_sets.append(self.search.indexes["item_name"].search(params["q"]))
+        # Himpunan terkecil dulu supaya irisannya murah
+        return intersect_rows(sorted(row_sets, key=len))
+
+    def query(self, params):
+        """One page of matching items: total, page, page_size, pages and items."""
+        page_size = _parse_int("page_size", params.get("page_size", DEFAULT_PAGE_SIZE))
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        page = _parse_int("page", params.get("page", 1))
+        if page < 1:
+            raise ValueError("page must be at least 1")
+        with timed("api_filter"):
+            rows = self.filter_rows(params)
+        total = len(self) if rows is None else len(rows)
+        order = rows if rows is not None else np.arange(total)
+        sort = params.get("sort")
+        if sort:
+            column = sort.lstrip("-")
+            if column not in self.columns:
+                raise ValueError(f"unknown sort column: {column}")
+            with timed("api_sort"):
+                order = sort_rows(self.frame, column, not sort.startswith("-"), rows)
+        start = (page - 1) * page_size
+        with timed("api_page"):
+            items = self.records(order[start:start + page_size])
+        return {"total": total, "page": page, "page_size": page_size, "pages": page_count(total, page_size), "items": items}
+
+    def item(self, shopid, itemid):
+        rows = intersect_rows([self.sorted["shopid"].equal([shopid]), self.sorted["itemid"].equal([itemid])])
+        return self.records(rows[:1])[0] if len(rows) else None
+
+    def records(self, rows):
+        page = self.frame.iloc[rows][self.columns]
+        # to_json menangani NA dan tanggal; hasilnya di-decode lagi agar bisa dibungkus metadata
+        return json.loads(page.to_json(orient="records", date_format="iso"))
+
+    def stats(self):
+        return {
+            "rows": len(self),
+            "shops": len(self.shop_names),
+            "built_at": self.built_at,
+            "filters": ["shopid", "itemid", "shop_name", "min_price", "max_price", "date", "date_from", "date_to",
+                        "upload_date", "upload_date_from", "upload_date_to", "q"],
+            "sort": self.columns,
+        }
+
+
+def _split(value):
+    return [part for part in (piece.strip() for piece in value.split(",")) if part]
+
+
+def _parse_int(name, value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer: {value!r}") from None
+
+
+def _parse_float(params, name):
+    if name not in params:
+        return None
+    try:
+        return float(params[name])
+    except ValueError:
+        raise ValueError(f"{name} must be a number: {params[name]!r}") from None
+
+
+def _parse_date(name, value):
+    try:
+        return pd.Timestamp(value).normalize()
+    except ValueError:
+        raise ValueError(f"{name} must be a date (YYYY-MM-DD): {value!r}") from None
+
+
+def _parse_dates(params, prefix):
+    # date=D sama dengan date_from=D&date_to=D; batas atas termasuk seluruh hari itu
+    low = high = None
+    if prefix in params:
+        low = high = _parse_date(prefix, params[prefix])
+    if f"{prefix}_from" in params:
+        low = _parse_date(f"{prefix}_from", params[f"{prefix}_from"])
+    if f"{prefix}_to" in params:
+        high = _parse_date(f"{prefix}_to", params[f"{prefix}_to"])
+    return low, None if high is None else high + pd.Timedelta(days=1)
+
+
+def load_frame(inputs, cache=None, max_workers=None, log=None):
+    """Extract and deduplicate every HAR found in ``inputs`` (files, archives, directories, globs)."""
+    paths = list(expand_archives(expand_inputs(inputs)))
+    frames = []
+    for result in iter_extract_files(paths, cache=cache, max_workers=max_workers):
+        if result.error:
+            if log:
+                log(f"{result.name}: {result.error}")
+        elif result.frame is not None and not result.frame.empty:
+            frames.append(result.frame)
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    return drop_duplicate_items(concat_frames(frames))
+
+
+def _signature(inputs):
+    signature = []
+    for path in expand_inputs(inputs):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return signature
+
+
+class Dataset:
+    """The QueryIndex currently served; ``refresh`` rebuilds it when the input files change.
+
+    The new index is built aside and swapped in, so queries never see a
+    half-built index.
+    """
+
+    def __init__(self, inputs, cache=None, max_workers=None, log=None):
+        self.inputs = inputs
+        self.cache = cache
+        self.max_workers = max_workers
+        self.log = log
+        self.signature = None
+        self.index = None
+        self.refresh()
+
+    def refresh(self):
+        signature = _signature(self.inputs)
+        if signature == self.signature:
+            return False
+        started = time.perf_counter()
+        index = QueryIndex(load_frame(self.inputs, self.cache, self.max_workers, self.log))
+        self.index, self.signature = index, signature
+        if self.log:
+            self.log(f"{len(signature)} files, {len(index)} items indexed in {time.perf_counter() - started:.1f}s")
+        return True
+
+    def watch(self, interval, stop):
+        while not stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                if self.log:
+                    self.log(f"reload failed: {type(e).__name__}: {e}")
+
+
+def make_handler(dataset, verbose=False):
+    """A read-only request handler class serving ``dataset``.
+
+    GET /items?shopid=&itemid=&shop_name=&min_price=&max_price=&date=&date_from=&date_to=&q=&sort=&page=&page_size=
+    GET /items/<shopid>/<itemid>
+    GET /stats
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "shopee_har"
+
+        def do_GET(self):
+            metrics = Metrics()
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            # Parameter yang diulang (?shopid=1&shopid=2) digabung seperti daftar dengan koma
+            params = {name: ",".join(values) for name, values in parse_qs(url.query).items()}
+            index = dataset.index
+            with collect_metrics(metrics):
+                try:
+                    if parts == ["items"]:
+                        status, body = 200, index.query(params)
+                    elif len(parts) == 3 and parts[0] == "items":
+                        item = index.item(_parse_int("shopid", parts[1]), _parse_int("itemid", parts[2]))
+                        status, body = (200, item) if item is not None else (404, {"error": "item not found"})
+                    elif parts == ["stats"]:
+                        status, body = 200, index.stats()
+                    else:
+                        status, body = 404, {"error": f"unknown path: {url.path}"}
+                except ValueError as e:
+                    status, body = 400, {"error": str(e)}
+                count("api:requests")
+            self._send(status, body)
+            log_metrics("api", metrics, path=url.path, status=status, total=body.get("total") if isinstance(body, dict) else None)
+
+        def _send(self, status, body, headers=()):
+            data = json.dumps(body, ensure_ascii=False, allow_nan=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_only(self):
+            self._send(405, {"error": "read-only API"}, [("Allow", "GET")])
+
+        do_POST = do_PUT = do_PATCH = do_DELETE = _read_only
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def write_sample_dir(directory, files=3, size=2 * 1024 * 1024, seed=0):
+    """Fill ``directory`` with synthetic HARs (a stand-in dataset for trying out or testing the API)."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for number in range(files):
+        path = os.path.join(directory, f"sample-{seed + number:03d}.har")
+        if not os.path.exists(path):
+            write_har(path + ".tmp", size, seed + number)
+            os.replace(path + ".tmp", path)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m shopee_har.api",
+        description="Serve extracted items as a local read-only HTTP/JSON API with indexed lookups.",
+    )
+    parser.add_argument("inputs", nargs="+", help="HAR files, archives, directories or glob patterns")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=default_workers(), help="worker processes for extraction (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="result cache directory (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    parser.add_argument("--reload", type=float, default=0, metavar="SECONDS", help="re-index when the input files change, checking this often (default: off)")
+    parser.add_argument("--sample", action="store_true", help="first fill the (single) input directory with synthetic HARs if it has none")
+    parser.add_argument("--sample-size", type=parse_size, default="2MB", help="size of each synthetic HAR (default: %(default)s)")
+    parser.add_argument("--metrics-log", metavar="PATH", help="write per-request timings as JSON lines ('-' for stderr)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    if args.sample:
+        if len(args.inputs) != 1:
+            parser.error("--sample needs exactly one input directory")
+        if not any(expand_inputs(args.inputs)):
+            write_sample_dir(args.inputs[0], size=args.sample_size)
+    if args.metrics_log:
+        configure_metrics_log(args.metrics_log)
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    dataset = Dataset(args.inputs, cache, args.workers, log)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(dataset, args.verbose))
+    stop = threading.Event()
+    if args.reload:
+        threading.Thread(target=dataset.watch, args=(args.reload, stop), daemon=True).start()
+    log(f"Serving {len(dataset.index)} items on http://{args.host}:{server.server_port}/items")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
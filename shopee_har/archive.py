@@ -0,0 +1,182 @@
+import contextlib
+import gzip
+import hashlib
+import io
+import os
+import struct
+import zipfile
+import zlib
+from collections import namedtuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Ekstensi yang diterima file uploader (tanpa titik); .zst hanya jika zstandard terpasang
+UPLOAD_TYPES = ["har", "gz", "zip"] + (["zst"] if zstandard is not None else [])
+UPLOAD_HELP = "File .har, atau arsip .har.gz / .zip" + (" / .zst" if zstandard is not None else "") + " berisi banyak HAR"
+
+# Satu HAR di dalam arsip. source: path, file object atau bytes arsipnya;
+# member: nama file di dalam zip (None untuk .gz/.zst); digest: sha256 arsip.
+# Arsip yang tidak bisa dibaca menjadi satu member kind "error" berisi pesan galatnya
+ArchiveMember = namedtuple("ArchiveMember", ["source", "kind", "member", "name", "size", "digest"])
+
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+
+def archive_kind(name):
+    """Return "zip", "gzip" or "zstd" for an archive file name, or None for a plain HAR."""
+    name = name.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith(".gz"):
+        return "gzip"
+    if name.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+def _is_path(source):
+    return isinstance(source, str) or hasattr(source, "__fspath__")
+
+
+def _source_name(source):
+    return os.fsdecode(source) if _is_path(source) else getattr(source, "name", "<upload>")
+
+
+def _source_size(source):
+    if _is_path(source):
+        return os.path.getsize(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer().nbytes
+    return getattr(source, "size", 0) or 0
+
+
+def _open_source(source, stack):
+    if _is_path(source):
+        return stack.enter_context(open(source, "rb"))
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # BytesIO berbagi buffer bytes tanpa menyalinnya
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _digest(source, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with contextlib.ExitStack() as stack:
+        fileobj = _open_source(source, stack)
+        if hasattr(fileobj, "getbuffer"):
+            with fileobj.getbuffer() as view:
+                digest.update(view)
+        else:
+            for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+                digest.update(chunk)
+        if not _is_path(source):
+            fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def expand_archives(files):
+    """Replace every .zip/.gz/.zst among ``files`` by ArchiveMembers for the HARs inside.
+
+    Plain HARs pass through unchanged. Nothing is decompressed here: zip
+    members are listed from the central directory and the streams are only
+    opened by the extractor. An archive that cannot be read (e.g. a corrupt
+    zip) yields a single member that fails when it is extracted, so it is
+    reported like any other failed file.
+    """
+    for file in files:
+        name = _source_name(file)
+        kind = archive_kind(name)
+        if kind is None:
+            yield file
+            continue
+        try:
+            digest = _digest(file)
+            if kind == "zip":
+                with contextlib.ExitStack() as stack:
+                    with zipfile.ZipFile(_open_source(file, stack)) as archive:
+                        infos = archive.infolist()
+        except (zipfile.BadZipFile, OSError) as e:
+            yield ArchiveMember(file, "error", f"{type(e).__name__}: {e}", name, 0, None)
+            continue
+        if kind != "zip":
+            yield ArchiveMember(file, kind, None, name, _source_size(file), digest)
+            continue
+        for info in infos:
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or not info.filename.lower().endswith(".har"):
+                continue
+            yield ArchiveMember(file, kind, info.filename, f"{name}/{info.filename}", info.file_size, digest)
+
+
+@contextlib.contextmanager
+def open_member(member):
+    """Open the decompressed byte stream of one ArchiveMember."""
+    if member.kind == "error":
+        raise ValueError(f"Unreadable archive ({member.member})")
+    with contextlib.ExitStack() as stack:
+        fileobj = _open_source(member.source, stack)
+        if member.kind == "gzip":
+            yield stack.enter_context(gzip.GzipFile(fileobj=fileobj, mode="rb"))
+        elif member.kind == "zstd":
+            if zstandard is None:
+                raise RuntimeError(".zst archives need zstandard")
+            yield stack.enter_context(zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True, closefd=False))
+        elif member.kind == "zip":
+            archive = stack.enter_context(zipfile.ZipFile(fileobj))
+            yield stack.enter_context(archive.open(member.member))
+        elif member.kind == "deflate":
+            yield _InflateReader(fileobj)
+        else:
+            yield fileobj
+
+
+def detach_member(member):
+    """Return a copy of a zip member that carries only its own compressed bytes.
+
+    Used before sending an uploaded zip to a worker process, so each job
+    ships one member instead of the whole archive. Other members (and
+    compression methods other than stored/deflate) are returned unchanged.
+    """
+    if member.kind != "zip" or _is_path(member.source):
+        return member
+    with contextlib.ExitStack() as stack:
+        fileobj = _open_source(member.source, stack)
+        with zipfile.ZipFile(fileobj) as archive:
+            info = archive.getinfo(member.member)
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) or info.flag_bits & 0x1:
+            return member
+        fileobj.seek(info.header_offset)
+        signature, name_length, extra_length = _LOCAL_HEADER.unpack(fileobj.read(_LOCAL_HEADER.size))
+        if signature != b"PK\x03\x04":
+            return member
+        fileobj.seek(name_length + extra_length, os.SEEK_CUR)
+        data = fileobj.read(info.compress_size)
+        fileobj.seek(0)
+    kind = "deflate" if info.compress_type == zipfile.ZIP_DEFLATED else "stored"
+    return member._replace(source=data, kind=kind)
+
+
+class _InflateReader:
+    """Readable stream over raw deflate data (a zip member without its archive)."""
+
+    def __init__(self, fileobj, chunk_size=1 << 20):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        self.pending = b""
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(self.chunk_size), b""))
+        while len(self.pending) < size and not self.inflater.eof:
+            compressed = self.inflater.unconsumed_tail or self.fileobj.read(self.chunk_size)
+            if not compressed:
+                break
+            self.pending += self.inflater.decompress(compressed, size - len(self.pending))
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
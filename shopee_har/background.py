@@ -0,0 +1,102 @@
+import threading
+import time
+
+from .metrics import Metrics
+from .parallel import iter_extract_files
+from .progress import Progress, track_progress
+
+
+class ExtractionJob:
+    """Runs ``iter_extract_files`` in a background thread.
+
+    FileResults are appended to the job as each file finishes, so a UI can
+    show partial data while later files are still parsing. Entry and item
+    counts are tracked in a Progress while a file is being read, so even a
+    single large upload shows progress. ``cancel`` stops the file being
+    read inline or split at its next batch of entries; files not yet
+    started in the pool are not run.
+    """
+
+    def __init__(self, files, cache=None, max_workers=None):
+        self.files = list(files)
+        self.results = []
+        self.rows = 0
+        self.released = False
+        self.metrics = Metrics()
+        self.error = None
+        self.started = time.perf_counter()
+        self.finished = None
+        self._changed = threading.Condition()
+        self._progress = Progress()
+        self._thread = threading.Thread(target=self._run, args=(cache, max_workers), name="shopee_har-extract", daemon=True)
+        self._thread.start()
+
+    def _run(self, cache, max_workers):
+        results = iter_extract_files(self.files, cache=cache, max_workers=max_workers)
+        try:
+            with track_progress(self._progress):
+                for result in results:
+                    if self._progress.cancelled:
+                        break
+                    with self._changed:
+                        self.results.append(result)
+                        self.rows += len(result.frame) if result.frame is not None else 0
+                        self.metrics.merge(result.metrics)
+                        self._changed.notify_all()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            results.close()
+            with self._changed:
+                self.finished = time.perf_counter()
+                self._changed.notify_all()
+
+    @property
+    def done(self):
+        return self.finished is not None
+
+    @property
+    def cancelled(self):
+        return self._progress.cancelled
+
+    def cancel(self):
+        self._progress.cancel()
+
+    def snapshot(self):
+        """Return (results so far, a copy of their merged Metrics)."""
+        with self._changed:
+            return list(self.results), Metrics(self.metrics.timings, self.metrics.counters)
+
+    def progress(self):
+        """Files done/total, entries scanned, items and rows found so far, elapsed seconds."""
+        results, metrics = self.snapshot()
+        counters = metrics.counters
+        return {
+            "files_done": len(results),
+            "files_total": len(self.files),
+            "entries": self._progress.entries,
+            "items": self._progress.items,
+            "rows": self.rows,
+            "errors": counters["errors"],
+            "seconds": (self.finished or time.perf_counter()) - self.started,
+            "done": self.done,
+        }
+
+    def release_frames(self, cache):
+        """Drop the frames of finished files that are in ``cache``, once a shared dataset was built from them.
+
+        They can be read back with ``result_frames(results, cache, job.files)``,
+        which extracts a file again if the cache evicts it later.
+        """
+        with self._changed:
+            self.results = [
+                result._replace(frame=None) if result.frame is not None and result.key is not None and result.key in cache else result
+                for result in self.results
+            ]
+            self.released = True
+
+    def wait(self, seen=0, timeout=None):
+        """Block until more than ``seen`` results are in or the job is done; returns whether it is done."""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.results) > seen or self.done, timeout)
+            return self.done
@@ -0,0 +1,242 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from .cache import DEFAULT_CACHE_DIR
+from .decode import active_backend, loads, select_backend
+from .endpoints import locate_items, match_endpoint
+from .export import CsvWriter
+from .extract import decode_body, extract_frame
+from .fields import create_shopee_url, find_value
+from .layouts import extract_layout
+from .metrics import collect_metrics, timed
+from .parallel import default_workers, extract_har_parallel, get_pool
+from .reader import iter_raw_har_entries
+from .shapes import FALLBACK_KEYS, iter_item_fields
+from .synthetic import GENERATOR_VERSION, parse_size, write_har
+
+BENCH_DIR = os.path.join(DEFAULT_CACHE_DIR, "bench")
+CASES = ("stages", "extract", "parallel", "micro")
+
+
+def synthetic_har(size, seed=0, directory=BENCH_DIR):
+    """Return the path of a synthetic HAR of ``size`` bytes, generating it once."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"synthetic-v{GENERATOR_VERSION}-seed{seed}-{size}.har")
+    if not os.path.exists(path):
+        tmp_path = path + ".tmp"
+        write_har(tmp_path, size, seed)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _peak_rss_mb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def profile_stages(path):
+    """Run the serial pipeline on one HAR with metrics collection on."""
+    with collect_metrics() as metrics:
+        frame = extract_frame(path)
+        with timed("layout"):
+            frame = extract_layout(frame)
+        with timed("export_csv"):
+            writer = CsvWriter(os.devnull)
+            writer.write(frame)
+            writer.close()
+    metrics.counters["rows"] = len(frame)
+    result = metrics.to_dict()
+    return {"stages": result["timings"], "counters": result["counters"]}
+
+
+def _micro(path, limit=5000):
+    items = []
+    for raw in iter_raw_har_entries(path):
+        entry = loads(raw)
+        endpoint = match_endpoint(entry)
+        payload = decode_body(entry["response"]["content"]) if endpoint else None
+        if payload is None:
+            continue
+        for _, found in locate_items(endpoint, payload):
+            items.extend(found)
+        if len(items) >= limit:
+            break
+    clock = time.perf_counter
+    started = clock()
+    for item in items:
+        for keys in FALLBACK_KEYS.values():
+            find_value(item, keys, None)
+    find_seconds = clock() - started
+    rows = list(iter_item_fields(items, Counter()))
+    started = clock()
+    for row in rows:
+        create_shopee_url("https://shopee.co.id/", row["name"], row["shopid"], row["itemid"])
+    url_seconds = clock() - started
+    return {
+        "find_value_calls_per_s": round(len(items) * len(FALLBACK_KEYS) / find_seconds) if find_seconds else None,
+        "create_shopee_url_per_s": round(len(rows) / url_seconds) if url_seconds else None,
+        "items": len(items),
+    }
+
+
+def run_case(case, path, workers, decoder=None):
+    """Run one benchmark case; meant to be called in a fresh process so peak RSS is its own."""
+    if decoder:
+        select_backend(*decoder)
+    started = time.perf_counter()
+    result = {"case": case}
+    if case == "stages":
+        result.update(profile_stages(path))
+        rows = result["counters"]["rows"]
+        entries = result["counters"]["entries"]
+    elif case == "micro":
+        result.update(_micro(path))
+        rows = entries = None
+    else:
+        if case == "extract":
+            frame = extract_frame(path)
+        else:
+            frame = extract_har_parallel(path, workers).to_frame()
+            get_pool(workers).shutdown(wait=True)
+        rows, entries = len(frame), None
+    seconds = time.perf_counter() - started
+    size = os.path.getsize(path)
+    result.update({
+        "seconds": round(seconds, 4),
+        "bytes": size,
+        "rows": rows,
+        "mb_per_s": round(size / (1 << 20) / seconds, 2),
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        "children_peak_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+    })
+    if rows is not None:
+        result["rows_per_s"] = round(rows / seconds)
+    if entries is not None:
+        result["entries_per_s"] = round(entries / seconds)
+    return result
+
+
+def run_benchmarks(sizes, cases=CASES, workers=None, seed=0, directory=BENCH_DIR, repeat=3):
+    """Run every case on a synthetic HAR of each size.
+
+    Each run gets a fresh process so peak RSS is its own; the fastest of
+    ``repeat`` runs is kept.
+    """
+    workers = workers or default_workers()
+    decoder = active_backend()[:2]
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        path = synthetic_har(size, seed, directory)
+        for case in cases:
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(1, mp_context=context) as pool:
+                    runs.append(pool.submit(run_case, case, path, workers, decoder).result())
+            result = min(runs, key=lambda run: run["seconds"])
+            result.update(size=size, repeat=repeat)
+            results.append(result)
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(), "workers": workers},
+        "decoder": list(decoder),
+        "generator": GENERATOR_VERSION,
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=0.15):
+    """Yield (size, case, baseline seconds, seconds, change, regressed) for cases present in both reports.
+
+    ``regressed`` is true when a case got slower by more than ``threshold``.
+    """
+    previous = {(result["size"], result["case"]): result for result in baseline["results"]}
+    for result in report["results"]:
+        before = previous.get((result["size"], result["case"]))
+        if before is None or not before.get("seconds"):
+            continue
+        change = result["seconds"] / before["seconds"] - 1
+        yield result["size"], result["case"], before["seconds"], result["seconds"], change, change > threshold
+
+
+def _format_size(size):
+    for unit, shift in (("GB", 30), ("MB", 20), ("KB", 10)):
+        if size >= 1 << shift:
+            return f"{size / (1 << shift):g}{unit}"
+    return f"{size}B"
+
+
+def print_report(report, file=sys.stdout):
+    print(f"decoder: {', '.join(report['decoder'])}  workers: {report['machine']['workers']}", file=file)
+    print(f"{'size':>8} {'case':<9} {'seconds':>9} {'MB/s':>8} {'rows/s':>10} {'entries/s':>10} {'peak MB':>8}", file=file)
+    for result in report["results"]:
+        print(
+            f"{_format_size(result['size']):>8} {result['case']:<9} {result['seconds']:>9.3f} {result['mb_per_s']:>8.1f} "
+            f"{result.get('rows_per_s', ''):>10} {result.get('entries_per_s', ''):>10} {result['peak_rss_mb'] or '':>8}",
+            file=file,
+        )
+        if "stages" in result:
+            print("         " + "  ".join(f"{stage}={seconds:.3f}s" for stage, seconds in result["stages"].items()), file=file)
+        if result["case"] == "micro":
+            print(f"         find_value={result['find_value_calls_per_s']}/s  create_shopee_url={result['create_shopee_url_per_s']}/s", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m shopee_har.bench",
+        description="Benchmark extraction on deterministic synthetic HARs and compare against saved baselines.",
+    )
+    parser.add_argument("--sizes", default="1MB,16MB,128MB", help="comma-separated HAR sizes (default: %(default)s)")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated cases (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=default_workers(), help="workers for the parallel case (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is reported (default: %(default)s)")
+    parser.add_argument("--dir", default=BENCH_DIR, help="where synthetic HARs and baselines live (default: %(default)s)")
+    parser.add_argument("--json", metavar="PATH", help="also write the full report as JSON")
+    parser.add_argument("--save", metavar="NAME", help="save the report as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baseline NAME; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.15, help="slowdown that counts as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    cases = args.cases.split(",")
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    report = run_benchmarks([parse_size(size) for size in args.sizes.split(",")], cases, args.workers, args.seed, args.dir, args.repeat)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fileobj:
+            json.dump(report, fileobj, indent=2)
+    if args.save:
+        with open(os.path.join(args.dir, f"{args.save}.json"), "w", encoding="utf-8") as fileobj:
+            json.dump(report, fileobj, indent=2)
+    if not args.compare:
+        return 0
+    with open(os.path.join(args.dir, f"{args.compare}.json"), encoding="utf-8") as fileobj:
+        baseline = json.load(fileobj)
+    regressed = False
+    print(f"\ncompared with {args.compare} ({baseline['created']}):")
+    for size, case, before, after, change, slower in compare(report, baseline, args.threshold):
+        regressed |= slower
+        print(f"{_format_size(size):>8} {case:<9} {before:>9.3f} -> {after:>9.3f}  {change:+.1%}{'  REGRESSION' if slower else ''}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+
+import pandas as pd
+
+from .archive import ArchiveMember
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# Naikkan setiap kali logika ekstraksi berubah supaya cache lama tidak dipakai
+EXTRACTOR_VERSION = "6"
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SHOPEE_HAR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "shopee_har")
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def hash_har(file, namespace="", chunk_size=1 << 20):
+    """Return the cache key of a HAR: sha256 of its bytes, the extractor version and a namespace.
+
+    ``file`` is a path or a seekable file object, which is rewound afterwards.
+    An ArchiveMember is keyed by its archive's digest and member name, so
+    nothing is decompressed.
+    """
+    return _digest(hashlib.sha256(f"{EXTRACTOR_VERSION}:{namespace}:".encode("utf-8")), file, chunk_size)
+
+
+def hash_content(file, chunk_size=1 << 20):
+    """Return the sha256 of a HAR's bytes alone, which stays the same across extractor versions.
+
+    Identifies files that were already ingested (see SnapshotStore.has_file);
+    ``hash_har`` is only for the result cache.
+    """
+    return _digest(hashlib.sha256(), file, chunk_size)
+
+
+def _digest(digest, file, chunk_size):
+    if isinstance(file, ArchiveMember):
+        digest.update(f"{file.digest}:{file.member}".encode("utf-8"))
+        return digest.hexdigest()
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        with open(file, "rb") as fileobj:
+            return _digest(digest, fileobj, chunk_size)
+    start = file.tell()
+    if hasattr(file, "getbuffer"):
+        # Upload Streamlit (BytesIO): hash langsung dari buffer tanpa menyalin
+        with file.getbuffer() as view:
+            digest.update(view[start:])
+        return digest.hexdigest()
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    file.seek(start)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of extracted frames keyed by ``hash_har``.
+
+    Frames are stored as Parquet (pickle when pyarrow is missing). Reads
+    refresh the file's mtime and the least recently used files are evicted
+    once the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = ".parquet" if HAS_PARQUET else ".pkl"
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            frame = pd.read_parquet(path) if HAS_PARQUET else pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # File rusak atau setengah tertulis: anggap tidak ada
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return frame
+
+    def put(self, key, frame):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            if HAS_PARQUET:
+                frame.to_parquet(tmp_path, index=False)
+            else:
+                frame.to_pickle(tmp_path)
+            os.replace(tmp_path, self._path(key))
+        finally:
+            self._remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(os.path.join(self.directory, name))
+            total -= size
+
+    def get_or_extract(self, file, extract, namespace=""):
+        """Return the cached frame for ``file`` or run ``extract(file)`` and store it.
+
+        Files without any product are cached too; they come back as None.
+        """
+        key = hash_har(file, namespace)
+        frame = self.get(key)
+        if frame is None:
+            frame = extract(file)
+            self.put(key, frame if frame is not None else pd.DataFrame())
+        return frame if frame is not None and not frame.empty else None
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
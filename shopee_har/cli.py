@@ -0,0 +1,132 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+from .archive import expand_archives
+from .cache import DEFAULT_CACHE_DIR, ResultCache, hash_content
+from .columns import concat_frames, drop_duplicate_items
+from .decode import active_backend
+from .entryindex import extract_indexed_frame
+from .export import open_writer
+from .extract import extract_frame
+from .history import SnapshotStore
+from .layouts import LAYOUTS
+from .metrics import Metrics, collect_metrics, configure_metrics_log, log_metrics, timed
+from .parallel import default_workers, iter_extract_files
+from .spill import PartitionStore
+from .synthetic import parse_size
+
+HAR_PATTERNS = ["*.har", "*.har.gz", "*.har.zst", "*.zip"]
+
+
+def expand_inputs(patterns):
+    """Resolve files, directories (searched recursively for .har and archives) and glob patterns."""
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = sorted(
+                path
+                for suffix in HAR_PATTERNS
+                for path in glob.glob(os.path.join(pattern, "**", suffix), recursive=True)
+            )
+        elif os.path.exists(pattern):
+            paths = [pattern]
+        else:
+            paths = sorted(glob.glob(pattern, recursive=True))
+        for path in paths:
+            if path not in seen and os.path.isfile(path):
+                seen.add(path)
+                yield path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m shopee_har",
+        description="Extract Shopee product data from HAR captures without Streamlit.",
+    )
+    parser.add_argument("inputs", nargs="+", help="HAR files, .har.gz/.zst/.zip archives, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="-", help="output .csv, .parquet or .xlsx file (default: CSV to stdout)")
+    parser.add_argument("-f", "--format", choices=["csv", "parquet", "xlsx"], help="output format when it cannot be taken from the extension")
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="full", help="column layout (default: full)")
+    parser.add_argument("-j", "--workers", type=int, default=default_workers(), help="worker processes (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="result cache directory (default: %(default)s)")
+    parser.add_argument("--dedup", action="store_true", help="keep one row per (shopid, itemid) across all files; holds every row in memory until the end")
+    parser.add_argument("--memory-budget", metavar="SIZE", type=parse_size, help="with --dedup, spill rows to disk partitions past this much memory, e.g. 512MB")
+    parser.add_argument("--spill-dir", help="directory for --memory-budget partitions (default: a temporary directory)")
+    parser.add_argument("--history", metavar="DB", help="also add item snapshots to this SQLite history store")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    parser.add_argument("--entry-index", action="store_true", help="keep a byte-offset index (<file>.idx) next to each HAR and read only product entries through it")
+    parser.add_argument("--metrics-log", metavar="PATH", help="write per-file and total stage timings/counters as JSON lines ('-' for stderr)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = list(expand_archives(expand_inputs(args.inputs)))
+    if not paths:
+        print("No HAR files found.", file=sys.stderr)
+        return 2
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    layout = LAYOUTS[args.layout]
+    store = SnapshotStore(args.history) if args.history else None
+    writer = open_writer(args.output, args.format)
+    if args.metrics_log:
+        configure_metrics_log(args.metrics_log)
+    started = time.perf_counter()
+    metrics = Metrics()
+    # Mode out-of-core: baris untuk --dedup ditampung di partisi disk, bukan di memori
+    spill = PartitionStore(args.spill_dir, args.memory_budget) if args.dedup and args.memory_budget else None
+    try:
+        with collect_metrics(metrics):
+            extract = extract_indexed_frame if args.entry_index else extract_frame
+            rows, failed = _extract_all(paths, cache, args.workers, args.dedup, layout, store, writer, spill, extract)
+    finally:
+        writer.close()
+        if spill is not None:
+            spill.close()
+        if store is not None:
+            store.close()
+    elapsed = time.perf_counter() - started
+    backend = active_backend()
+    log_metrics("run", metrics, files=len(paths), rows=rows, failed=failed, seconds=round(elapsed, 3), decoder=backend[:2])
+    print(
+        f"{len(paths)} files, {rows} rows, {failed} failed in {elapsed:.1f}s (decode: {backend.json}, {backend.base64})",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def _extract_all(paths, cache, workers, dedup, layout, store, writer, spill=None, extract=extract_frame):
+    rows = failed = 0
+    frames = []
+    for path, result in zip(paths, iter_extract_files(paths, cache=cache, max_workers=workers, extract=extract)):
+        log_metrics("file", result.metrics, name=result.name, error=result.error)
+        if result.error:
+            failed += 1
+            print(f"{result.name}: {result.error}", file=sys.stderr)
+            continue
+        if store is not None and result.frame is not None:
+            with timed("history"):
+                store.add_frame(result.frame, hash_content(path), result.name)
+        if result.frame is None:
+            continue
+        if spill is not None:
+            spill.add(result.frame)
+        elif dedup:
+            frames.append(result.frame)
+        else:
+            with timed("write"):
+                writer.write(layout(result.frame))
+            rows += len(result.frame)
+    if frames:
+        with timed("dedup"):
+            frame = drop_duplicate_items(concat_frames(frames))
+        with timed("write"):
+            writer.write(layout(frame))
+        rows = len(frame)
+    if spill is not None:
+        rows = spill.export(writer, layout)
+    return rows, failed
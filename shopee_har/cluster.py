@@ -0,0 +1,245 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import group_totals
+from .metrics import count, timed
+
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_PRICE_TOLERANCE = 0.3
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(values):
+    # splitmix64; perkalian uint64 numpy berputar (mod 2**64) tanpa error
+    z = values.astype(np.uint64) + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def name_tokens(names):
+    """Word tokens of each name, normalized like ``trim_name`` plus the slug of ``create_shopee_url``.
+
+    Returns (row, token id) arrays sorted by row; names without any token
+    get a token of their own so they only match themselves.
+    """
+    names = pd.Series(names, dtype=object).reset_index(drop=True)
+    slug = (
+        names.str.split().str.join(" ")
+        .str.replace(r"[^a-zA-Z0-9\s-]", "", regex=True)
+        .str.lower()
+        .str.replace("-", " ", regex=False)
+    )
+    tokens = slug.str.split().explode()
+    codes, uniques = pd.factorize(tokens)
+    rows = tokens.index.to_numpy()
+    empty = codes < 0
+    codes[empty] = len(uniques) + np.arange(empty.sum())
+    return rows, codes.astype(np.int64)
+
+
+def minhash_signatures(rows, codes, n, num_perm=DEFAULT_NUM_PERM, seed=0, chunk_rows=50000):
+    """MinHash signature (n x num_perm, uint32) of each row's token set."""
+    vocabulary = int(codes.max()) + 1 if len(codes) else 0
+    seeds = _mix(np.arange(num_perm, dtype=np.uint64) + np.uint64(seed * num_perm))
+    # Satu tabel hash per token unik, lalu minimum per baris
+    table = (_mix(np.arange(vocabulary, dtype=np.uint64)[:, None] ^ seeds[None, :]) >> np.uint64(32)).astype(np.uint32)
+    signatures = np.empty((n, num_perm), dtype=np.uint32)
+    bounds = np.searchsorted(rows, np.r_[np.arange(0, n, chunk_rows), n])
+    for start, begin, end in zip(range(0, n, chunk_rows), bounds[:-1], bounds[1:]):
+        part = rows[begin:end]
+        offsets = np.flatnonzero(np.r_[True, part[1:] != part[:-1]])
+        signatures[start:start + len(offsets)] = np.minimum.reduceat(table[codes[begin:end]], offsets, axis=0)
+    return signatures
+
+
+def band_keys(signatures, bands):
+    """LSH bucket key (n x bands, uint64) of every row; each band has its own key space."""
+    n, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    keys = np.empty((n, bands), dtype=np.uint64)
+    for band in range(bands):
+        key = np.full(n, band, dtype=np.uint64)
+        for column in range(band * rows_per_band, (band + 1) * rows_per_band):
+            key = _mix(key ^ signatures[:, column].astype(np.uint64))
+        keys[:, band] = key
+    return keys
+
+
+def _cell_keys(keys, cells, shift=0):
+    # Bucket LSH dipecah per sel harga (lebar = selisih harga maksimum)
+    return _mix(keys ^ (cells + shift).astype(np.uint64)[:, None])
+
+
+def _near_keys(keys, cells):
+    # Leader yang mungkin untuk sebuah baris ada di sel harga yang sama atau sebelahnya
+    return np.concatenate([_cell_keys(keys, cells, shift) for shift in (-1, 0, 1)], axis=1)
+
+
+def _shared_bucket_pairs(row_keys, rows, other_keys, others):
+    # Semua pasangan (row, other) yang berbagi minimal satu bucket
+    other_flat = other_keys.ravel()
+    owners = np.repeat(others, other_keys.shape[1])
+    order = np.argsort(other_flat, kind="stable")
+    other_flat, owners = other_flat[order], owners[order]
+    row_flat = row_keys.ravel()
+    low = np.searchsorted(other_flat, row_flat, "left")
+    sizes = np.searchsorted(other_flat, row_flat, "right") - low
+    left = np.repeat(np.repeat(rows, row_keys.shape[1]), sizes)
+    right = owners[np.arange(sizes.sum()) + np.repeat(low - (np.cumsum(sizes) - sizes), sizes)]
+    return left, right
+
+
+def _bucket_minima(keys, cells, rows):
+    # Baris yang tidak punya baris lebih kecil (di antara rows) di bucket dan sel harga dekatnya
+    own = _cell_keys(keys[rows], cells[rows]).ravel()
+    ids = np.repeat(rows, keys.shape[1])
+    order = np.lexsort((ids, own))
+    own, ids = own[order], ids[order]
+    starts = np.flatnonzero(np.r_[True, own[1:] != own[:-1]])
+    groups, minima = own[starts], ids[starts]
+    near = _near_keys(keys[rows], cells[rows])
+    position = np.searchsorted(groups, near).clip(max=len(groups) - 1)
+    blocking = np.where(groups[position] == near, minima[position], len(keys))
+    return blocking.min(axis=1) == rows
+
+
+def _assign(labels, best, rows, heads, signatures, log_price, threshold, max_gap):
+    # Baris pindah ke leader yang lebih mirip (seri: leader terkecil) di antara yang lolos cek harga
+    # dan nama; best berisi kemiripan dengan leader sekarang. Mengembalikan jumlah pasangan yang dicek
+    n = np.int64(len(labels))
+    pairs = np.unique(rows * n + heads)
+    rows, heads = pairs // n, pairs % n
+    close = np.abs(log_price[rows] - log_price[heads]) <= max_gap
+    rows, heads = rows[close], heads[close]
+    similarity = (signatures[rows] == signatures[heads]).mean(axis=1)
+    similar = similarity >= threshold
+    rows, heads, similarity = rows[similar], heads[similar], similarity[similar]
+    order = np.lexsort((heads, -similarity, rows))
+    order = order[np.r_[True, rows[order][1:] != rows[order][:-1]]] if len(order) else order
+    rows, heads, similarity = rows[order], heads[order], similarity[order]
+    better = (labels[rows] < 0) | (similarity > best[rows]) | ((similarity == best[rows]) & (heads < labels[rows]))
+    labels[rows[better]] = heads[better]
+    best[rows[better]] = similarity[better]
+    return len(close)
+
+
+def _leaders(keys, signatures, log_price, threshold, max_gap, chunk_rows=2048):
+    # Hasilnya sama dengan memproses baris satu per satu: baris ikut leader sebelumnya yang
+    # sebucket, lolos cek nama + harga dan paling mirip; kalau tidak ada jadi leader baru
+    n = len(keys)
+    cells = np.floor(log_price / max(max_gap, 1e-6)).astype(np.int64)
+    labels = np.full(n, -1, dtype=np.int64)
+    best = np.zeros(n)
+    # Kunci bucket + sel harga -> leader dari potongan-potongan sebelumnya
+    index = {}
+    rounds = compared = 0
+    for start in range(0, n, chunk_rows):
+        pending = np.arange(start, min(start + chunk_rows, n))
+        own = _cell_keys(keys[pending], cells[pending])
+        hits = [index.get(key, ()) for key in own.ravel().tolist()]
+        sizes = np.fromiter(map(len, hits), dtype=np.int64, count=len(hits))
+        heads = np.fromiter(itertools.chain.from_iterable(hits), dtype=np.int64, count=int(sizes.sum()))
+        compared += _assign(labels, best, np.repeat(np.repeat(pending, own.shape[1]), sizes), heads, signatures, log_price, threshold, max_gap)
+        followers = pending[labels[pending] >= 0]
+        pending = pending[labels[pending] < 0]
+        # Sisa potongan diputuskan per putaran. Baris yang terkecil di semua bucket-nya (di antara
+        # yang belum diputuskan) sudah tahu semua leader sebelumnya, jadi bisa langsung diputuskan
+        leaders = np.empty(0, dtype=np.int64)
+        while len(pending):
+            rounds += 1
+            first = _bucket_minima(keys, cells, pending)
+            ready, pending = pending[first], pending[~first]
+            if len(leaders):
+                rows, heads = _shared_bucket_pairs(_near_keys(keys[ready], cells[ready]), ready, _cell_keys(keys[leaders], cells[leaders]), leaders)
+                compared += _assign(labels, best, rows, heads, signatures, log_price, threshold, max_gap)
+            new = ready[labels[ready] < 0]
+            labels[new] = new
+            leaders = np.concatenate([leaders, new])
+        if len(followers) and len(leaders):
+            # Leader baru di potongan ini bisa lebih mirip daripada leader lama
+            rows, heads = _shared_bucket_pairs(_near_keys(keys[followers], cells[followers]), followers, _cell_keys(keys[leaders], cells[leaders]), leaders)
+            rows, heads = rows[heads < rows], heads[heads < rows]
+            compared += _assign(labels, best, rows, heads, signatures, log_price, threshold, max_gap)
+        # Leader didaftarkan di sel harganya dan kedua sel sebelahnya, jadi cukup satu kunci per band saat mencari
+        for leader, near in zip(leaders.tolist(), _near_keys(keys[leaders], cells[leaders]).tolist()):
+            for key in near:
+                index.setdefault(key, []).append(leader)
+    count("cluster:rounds", rounds)
+    count("cluster:compared", compared)
+    return labels
+
+
+def cluster_labels(names, prices, threshold=DEFAULT_THRESHOLD, price_tolerance=DEFAULT_PRICE_TOLERANCE,
+                   num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS, seed=0):
+    """Cluster id (0..k-1, in order of first appearance) of every listing.
+
+    Every cluster has a leader, its first listing. A listing joins the
+    most similar earlier leader whose name has an estimated Jaccard
+    similarity (MinHash over normalized word tokens) of at least
+    ``threshold`` and whose price is within ``price_tolerance`` (0.3 =
+    30%); otherwise it leads a new cluster. Checking against the leader
+    rather than chaining links keeps a cluster within one product and one
+    price band. Only leaders sharing an LSH bucket (``bands`` bands of
+    ``num_perm // bands`` hashes) and a neighbouring price cell are
+    compared, so the work grows with the leaders per bucket, not O(n^2).
+    """
+    names = pd.Series(names, dtype=object)
+    n = len(names)
+    if not n:
+        return np.zeros(0, dtype=np.int64)
+    with timed("cluster_minhash"):
+        rows, codes = name_tokens(names)
+        signatures = minhash_signatures(rows, codes, n, num_perm, seed)
+        keys = band_keys(signatures, bands)
+    log_price = np.log(np.asarray(pd.to_numeric(pd.Series(prices), errors="coerce"), dtype=np.float64).clip(min=1e-9))
+    # Harga kosong hanya dikelompokkan dengan harga kosong
+    log_price = np.nan_to_num(log_price, nan=-1e9)
+    with timed("cluster_leaders"):
+        labels = _leaders(keys, signatures, log_price, threshold, np.log1p(price_tolerance))
+    return np.unique(labels, return_inverse=True)[1].astype(np.int64)
+
+
+def cluster_frame(frame, **options):
+    """``frame`` with a ``cluster_id`` column from ``cluster_labels`` on item_name and price."""
+    return frame.assign(cluster_id=cluster_labels(frame["item_name"], frame["price"], **options))
+
+
+def cluster_totals(frame, column="cluster_id"):
+    """Per-cluster aggregates, largest revenue first.
+
+    Besides the ``group_totals`` measures: number of shops, price range,
+    the name of the best-selling listing and the shop with the largest
+    revenue share in the cluster.
+    """
+    totals = group_totals(frame, column)
+    totals.index = totals.index.astype(np.int64)
+    revenue = frame["sold_30_days"].to_numpy(dtype=np.float64, na_value=0) * np.nan_to_num(frame["price"].to_numpy(dtype=np.float64, na_value=np.nan))
+    values = pd.DataFrame({
+        column: frame[column].to_numpy(),
+        "shop_name": frame["shop_name"].astype(object).to_numpy(),
+        "shopid": frame["shopid"].to_numpy(),
+        "item_name": frame["item_name"].astype(object).to_numpy(),
+        "price": frame["price"].to_numpy(dtype=np.float64, na_value=np.nan),
+        "sold": frame["sold_30_days"].to_numpy(dtype=np.float64, na_value=0),
+        "revenue": revenue,
+    })
+    grouped = values.groupby(column, sort=False)
+    totals["shops"] = grouped["shopid"].nunique()
+    totals["min_price"] = grouped["price"].min()
+    totals["median_price"] = grouped["price"].median()
+    totals["max_price"] = grouped["price"].max()
+    totals["item_name"] = values["item_name"].to_numpy()[grouped["sold"].idxmax().reindex(totals.index).to_numpy()]
+    shop_revenue = values.groupby([column, "shop_name"], sort=False)["revenue"].sum()
+    top_shop = shop_revenue.groupby(level=0).idxmax().str[1]
+    totals["top_shop"] = top_shop.reindex(totals.index)
+    totals["top_shop_share"] = (shop_revenue.groupby(level=0).max() / totals["total_revenue"]).where(totals["total_revenue"] > 0)
+    totals = totals.sort_values(["total_revenue", "items"], ascending=False, kind="stable")
+    return totals.reset_index()
@@ -0,0 +1,236 @@
+import datetime
+from array import array
+
+import numpy as np
+import pandas as pd
+
+SHOPEE_BASE_URL = "https://shopee.co.id/"
+
+# Urutan kolom hasil akhir
+COLUMNS = [
+    "item_name", "price", "sold_30_days", "historical_sold", "shopee_url", "shop_name",
+    "is_sold_out", "itemid", "shopid", "upload_date", "rating_star", "rating_count",
+    "shop_rating", "shop_location", "source", "sources", "last_update",
+]
+
+CATEGORY_COLUMNS = ["shop_name", "shop_location", "source", "sources"]
+
+ITEM_KEY = ["shopid", "itemid"]
+
+_NAN = float("nan")
+
+
+def _as_int(value):
+    # 0 dipakai sebagai penanda kosong untuk id
+    try:
+        return int(value) if value is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+def _as_float(value):
+    if value is None or isinstance(value, bool):
+        return _NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _NAN
+
+def _as_flag(value):
+    return -1 if value is None else int(bool(value))
+
+def _merge_sources(existing, new):
+    if new is None or existing == new:
+        return existing
+    if existing is None:
+        return new
+    merged = set(existing.split(", ")) | set(new.split(", "))
+    return ", ".join(sorted(merged))
+
+
+# (nama atribut, typecode array atau None untuk list biasa)
+_BUFFERS = (
+    ("itemid", "q"), ("shopid", "q"), ("price", "d"), ("monthly_sold", "d"), ("historical_sold", "d"),
+    ("rating_star", "d"), ("rating_count", "d"), ("shop_rating", "d"), ("ctime", "d"), ("is_sold_out", "b"),
+    ("name", None), ("shop_name", None), ("shop_location", None), ("source", None), ("started", None),
+)
+_BUFFER_NAMES = tuple(name for name, _ in _BUFFERS)
+
+
+class ColumnBuffer:
+    """Accumulates extracted items column by column.
+
+    Numeric fields go into typed ``array`` buffers and text fields into
+    plain lists; all per-row formatting is deferred to ``to_frame``.
+
+    With ``dedup=True`` rows are indexed by (shopid, itemid): a repeated
+    item overwrites the stored row only when its ``started`` timestamp is
+    at least as recent, and the sources of every occurrence are recorded
+    in the ``sources`` column.
+    """
+
+    def __init__(self, dedup=False):
+        for name, typecode in _BUFFERS:
+            setattr(self, name, array(typecode) if typecode else [])
+        self.sources = []
+        self.dedup = dedup
+        self.index = {}
+
+    def __len__(self):
+        return len(self.itemid)
+
+    def append(self, fields, source=None, started=None):
+        """Append one item from the raw field dict of ``iter_item_fields``."""
+        rating_count = fields["rating_count"]
+        if isinstance(rating_count, list):
+            rating_count = rating_count[0] if rating_count else None
+        self._add((
+            _as_int(fields["itemid"]),
+            _as_int(fields["shopid"]),
+            _as_float(fields["price"]),
+            _as_float(fields["monthly_sold"]),
+            _as_float(fields["historical_sold"]),
+            _as_float(fields["rating_star"]),
+            _as_float(rating_count),
+            _as_float(fields["shop_rating"]),
+            _as_float(fields["ctime"]),
+            _as_flag(fields["is_sold_out"]),
+            fields["name"] if isinstance(fields["name"], str) else None,
+            fields["shop_name"],
+            fields["shop_location"],
+            source,
+            started,
+        ), source)
+
+    def _add(self, values, sources):
+        itemid, shopid = values[0], values[1]
+        if self.dedup and itemid and shopid:
+            key = (shopid, itemid)
+            position = self.index.get(key)
+            if position is not None:
+                self.sources[position] = _merge_sources(self.sources[position], sources)
+                if (values[14] or "") >= (self.started[position] or ""):
+                    for name, value in zip(_BUFFER_NAMES, values):
+                        getattr(self, name)[position] = value
+                return
+            self.index[key] = len(self.itemid)
+        for name, value in zip(_BUFFER_NAMES, values):
+            getattr(self, name).append(value)
+        self.sources.append(sources)
+
+    def extend(self, other):
+        if not self.dedup:
+            for name in _BUFFER_NAMES + ("sources",):
+                getattr(self, name).extend(getattr(other, name))
+            return
+        columns = [getattr(other, name) for name in _BUFFER_NAMES]
+        for values, sources in zip(zip(*columns), other.sources):
+            self._add(values, sources)
+
+    def to_frame(self, base_url=SHOPEE_BASE_URL):
+        """Build the final DataFrame with vectorized post-processing."""
+        if not len(self):
+            return pd.DataFrame(columns=COLUMNS)
+
+        itemid = pd.array(np.frombuffer(self.itemid, dtype=np.int64), dtype="Int64")
+        shopid = pd.array(np.frombuffer(self.shopid, dtype=np.int64), dtype="Int64")
+        itemid[itemid == 0] = pd.NA
+        shopid[shopid == 0] = pd.NA
+
+        # Sama dengan trim_name dan create_shopee_url, tetapi per kolom
+        names = pd.Series(self.name, dtype=object).str.split().str.join(" ")
+        slug = (
+            names.str.replace(r"[^a-zA-Z0-9\s-]", "", regex=True)
+            .str.strip()
+            .str.lower()
+            .str.replace(" ", "-", regex=False)
+            .str.replace(r"-{2,}", "-", regex=True)
+        )
+        urls = (base_url.rstrip("/") + "/" + slug + "-i." + pd.Series(shopid).astype(str) + "." + pd.Series(itemid).astype(str))
+        urls = urls.where(names.fillna("").str.len().gt(0) & pd.Series(itemid).notna() & pd.Series(shopid).notna(), "")
+
+        local_tz = datetime.datetime.now().astimezone().tzinfo
+        upload_date = (
+            pd.to_datetime(np.frombuffer(self.ctime, dtype=np.float64), unit="s", utc=True)
+            .tz_convert(local_tz)
+            .tz_localize(None)
+            .normalize()
+        )
+        last_update = (
+            pd.to_datetime(pd.Series(self.started, dtype=object), utc=True, format="ISO8601", errors="coerce")
+            .dt.tz_convert(local_tz)
+            .dt.tz_localize(None)
+        )
+
+        sold_out = np.frombuffer(self.is_sold_out, dtype=np.int8)
+        is_sold_out = pd.array(sold_out == 1, dtype="boolean")
+        is_sold_out[sold_out < 0] = pd.NA
+
+        frame = pd.DataFrame({
+            "item_name": names,
+            "price": np.frombuffer(self.price, dtype=np.float64) / 100000,
+            "sold_30_days": self._counts(self.monthly_sold),
+            "historical_sold": self._counts(self.historical_sold),
+            "shopee_url": urls,
+            "shop_name": pd.Categorical(self.shop_name),
+            "is_sold_out": is_sold_out,
+            "itemid": itemid,
+            "shopid": shopid,
+            "upload_date": upload_date,
+            "rating_star": np.round(np.frombuffer(self.rating_star, dtype=np.float64), 1),
+            "rating_count": self._counts(self.rating_count),
+            "shop_rating": np.round(np.frombuffer(self.shop_rating, dtype=np.float64), 1),
+            "shop_location": pd.Categorical(self.shop_location),
+            "source": pd.Categorical(self.source),
+            "sources": pd.Categorical(self.sources),
+            "last_update": last_update,
+        })
+        return frame
+
+    @staticmethod
+    def _counts(values):
+        values = np.frombuffer(values, dtype=np.float64)
+        counts = pd.array(np.nan_to_num(values).astype(np.int64), dtype="Int64")
+        counts[np.isnan(values)] = pd.NA
+        return counts
+
+
+def concat_frames(frames):
+    """Concatenate per-file frames, keeping the categorical columns categorical."""
+    frame = pd.concat(frames, ignore_index=True)
+    for column in CATEGORY_COLUMNS:
+        if column in frame and frame[column].dtype != "category":
+            frame[column] = frame[column].astype("category")
+    return frame
+
+
+def drop_duplicate_items(frame):
+    """Keep one row per (shopid, itemid): the most recently captured one.
+
+    Used to merge frames that were each de-duplicated during extraction;
+    the ``sources`` of the dropped rows are folded into the kept row.
+    Rows without ids are left alone.
+    """
+    keyed = frame["shopid"].notna() & frame["itemid"].notna()
+    duplicated = keyed & frame.duplicated(ITEM_KEY, keep=False)
+    if not duplicated.any():
+        return frame
+
+    # Dibalik supaya idxmax memilih kemunculan terakhir jika waktunya sama
+    rows = frame[duplicated].iloc[::-1]
+    group_keys = [rows["shopid"], rows["itemid"]]
+    stamps = rows["last_update"].fillna(pd.Timestamp.min)
+    keep = stamps.groupby(group_keys, sort=False).idxmax()
+    sources = rows["sources"].astype(object).groupby(group_keys, sort=False).agg(_merge_all_sources)
+
+    result = frame[~duplicated | frame.index.isin(keep.to_numpy())].copy()
+    merged = result["sources"].astype(object)
+    merged.loc[keep.to_numpy()] = sources.reindex(keep.index).to_numpy()
+    result["sources"] = merged.astype("category")
+    return result
+
+
+def _merge_all_sources(values):
+    merged = None
+    for value in values:
+        merged = _merge_sources(merged, value if isinstance(value, str) else None)
+    return merged
@@ -0,0 +1,114 @@
+import binascii
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+# Backend decode body: loads menerima bytes atau str, b64decode menerima str ASCII
+Backend = namedtuple("Backend", ["json", "base64", "loads", "b64decode"])
+
+JSON_BACKENDS = {"stdlib": json.loads}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = orjson.loads
+
+BASE64_BACKENDS = {"binascii": binascii.a2b_base64}
+if pybase64 is not None:
+    BASE64_BACKENDS["pybase64"] = pybase64.b64decode
+
+_active = None
+_lock = threading.Lock()
+
+
+def _sample_body():
+    item = {
+        "item_basic": {
+            "itemid": 23456789012, "shopid": 123456789, "name": "Kaos Polos Pria Wanita Cotton Combed 30s",
+            "price": 4500000000, "historical_sold": 12345, "sold": 321, "shop_location": "Kota Jakarta Barat",
+            "item_rating": {"rating_star": 4.87, "rating_count": [1200, 3, 4, 20, 173, 1000]},
+            "images": ["sg-11134201-7rbk0-lq8ms1j8x4x2a0"] * 8, "is_sold_out": False, "ctime": 1700000000,
+        },
+    }
+    return json.dumps({"items": [item] * 60, "nomore": False}).encode("utf-8")
+
+
+def _time(function, argument, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function(argument)
+    return time.perf_counter() - started
+
+
+def benchmark(repeat=20):
+    """Time every available JSON and base64 backend on a typical search body.
+
+    Returns ``{"json": {name: seconds}, "base64": {name: seconds}}``.
+    """
+    body = _sample_body()
+    encoded = binascii.b2a_base64(body, newline=False).decode("ascii")
+    return {
+        "json": {name: _time(loads, body, repeat) for name, loads in JSON_BACKENDS.items()},
+        "base64": {name: _time(b64decode, encoded, repeat) for name, b64decode in BASE64_BACKENDS.items()},
+    }
+
+
+def select_backend(json_name=None, base64_name=None):
+    """Choose the decode backend and make it active.
+
+    Names default to the SHOPEE_HAR_JSON / SHOPEE_HAR_BASE64 environment
+    variables; whatever is still unset is picked by a quick benchmark.
+    """
+    global _active
+    json_name = json_name or os.environ.get("SHOPEE_HAR_JSON")
+    base64_name = base64_name or os.environ.get("SHOPEE_HAR_BASE64")
+    if json_name is None or base64_name is None:
+        timings = benchmark()
+        json_name = json_name or min(timings["json"], key=timings["json"].get)
+        base64_name = base64_name or min(timings["base64"], key=timings["base64"].get)
+    if json_name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown or unavailable JSON backend: {json_name}")
+    if base64_name not in BASE64_BACKENDS:
+        raise ValueError(f"Unknown or unavailable base64 backend: {base64_name}")
+    _active = Backend(json_name, base64_name, JSON_BACKENDS[json_name], BASE64_BACKENDS[base64_name])
+    return _active
+
+
+def active_backend():
+    """Return the active Backend, selecting one on first use."""
+    if _active is None:
+        with _lock:
+            if _active is None:
+                select_backend()
+    return _active
+
+
+def loads(data):
+    """Parse JSON from bytes or str with the active backend.
+
+    Documents the fast parser rejects (NaN, invalid UTF-8 escapes, ...) are
+    retried with the standard library, so results never depend on the backend.
+    """
+    backend = active_backend()
+    try:
+        return backend.loads(data)
+    except ValueError:
+        if backend.loads is json.loads:
+            raise
+        return json.loads(data)
+
+
+def decode_content(text, encoding=None):
+    """Parse a HAR ``content.text``; base64 bodies are decoded to bytes and parsed without a str copy."""
+    if (encoding or "").lower() == "base64":
+        text = active_backend().b64decode(text)
+    return loads(text)
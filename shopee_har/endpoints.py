@@ -0,0 +1,114 @@
+import re
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from .fields import find_value
+
+# Label sumber produk, sama dengan kelompok di process_har_files
+SOURCE_AKTIF = "Aktif"
+SOURCE_TIDAK_AKTIF = "Tidak Aktif"
+SOURCE_PRODUK_SERUPA = "Produk Serupa"
+SOURCE_ITEM_CARD = "Item Card"
+SOURCE_LAINNYA = "Lainnya"
+
+JSON_MIME_TYPES = ("application/json", "text/json", "text/plain")
+
+Endpoint = namedtuple("Endpoint", ["name", "path", "locators", "mime_types"])
+
+
+# Locator: ambil list produk dari satu bentuk respons yang dikenal.
+# Setiap locator menghasilkan pasangan (source, items).
+
+def locate_data_items(payload):
+    data = payload.get("data")
+    if isinstance(data, dict) and isinstance(data.get("items"), list):
+        yield SOURCE_AKTIF, data["items"]
+
+def locate_item_basic(payload):
+    items = payload.get("items")
+    if isinstance(items, list):
+        yield SOURCE_TIDAK_AKTIF, [item for item in items if isinstance(item, dict) and item.get("item_basic")]
+
+def locate_sections(payload):
+    data = payload.get("data")
+    sections = data.get("sections") if isinstance(data, dict) else None
+    if not isinstance(sections, list):
+        return
+    for section in sections:
+        section_data = section.get("data") if isinstance(section, dict) else None
+        if isinstance(section_data, dict) and isinstance(section_data.get("item"), list):
+            yield SOURCE_PRODUK_SERUPA, section_data["item"]
+
+def locate_item_cards(payload):
+    for container in (payload, payload.get("data")):
+        if isinstance(container, dict) and isinstance(container.get("item_cards"), list):
+            yield SOURCE_ITEM_CARD, container["item_cards"]
+            return
+
+def locate_any(payload):
+    # Cara lama: list pertama dengan kunci item_cards/items/item di mana saja
+    items = find_value(payload, ["item_cards", "items", "item"], [])
+    if isinstance(items, list):
+        yield SOURCE_LAINNYA, [item for item in items if isinstance(item, dict)]
+
+
+def _endpoint(name, path, locators, mime_types=JSON_MIME_TYPES):
+    return Endpoint(name, re.compile(path), tuple(locators), tuple(mime_types))
+
+DEFAULT_ENDPOINTS = (
+    _endpoint("search_items", r"^/api/v4/search/search_items", [locate_item_cards, locate_item_basic]),
+    _endpoint("recommend_post", r"^/api/v4/recommend/recommend_post", [locate_sections, locate_item_cards]),
+    _endpoint("recommend", r"^/api/v4/recommend/recommend(_v2)?$", [locate_sections, locate_item_cards, locate_data_items]),
+    _endpoint("shop_items", r"^/api/v4/shop/(rcmd_items|search_items|get_shop_tab)", [locate_data_items, locate_item_basic, locate_item_cards]),
+    _endpoint("item_cards_feed", r"^/api/v4/(homepage/get_daily_discover|pdp/get_rw|pdp/hot_sales)", [locate_item_cards, locate_data_items]),
+    # Penampung untuk endpoint lain yang path-nya memuat "items" (filter lama)
+    _endpoint("other_items", r"items", [locate_data_items, locate_item_basic, locate_sections, locate_item_cards]),
+)
+
+ENDPOINTS = list(DEFAULT_ENDPOINTS)
+
+
+def register_endpoint(name, path, locators, mime_types=JSON_MIME_TYPES):
+    """Add an endpoint in front of the registry so it wins over the defaults."""
+    unregister_endpoint(name)
+    endpoint = _endpoint(name, path, locators, mime_types)
+    ENDPOINTS.insert(0, endpoint)
+    return endpoint
+
+def unregister_endpoint(name):
+    ENDPOINTS[:] = [endpoint for endpoint in ENDPOINTS if endpoint.name != name]
+
+
+def match_endpoint(entry, endpoints=None):
+    """Return the Endpoint for a HAR entry, or None when it is not a product API.
+
+    Only the request URL and response mimeType are inspected, so noise
+    entries are rejected before their body is decoded.
+    """
+    url = entry.get("request", {}).get("url")
+    if not url:
+        return None
+    path = urlsplit(url).path
+    mime_type = entry.get("response", {}).get("content", {}).get("mimeType") or ""
+    for endpoint in ENDPOINTS if endpoints is None else endpoints:
+        if endpoint.path.search(path) and (not mime_type or mime_type.startswith(endpoint.mime_types)):
+            return endpoint
+    return None
+
+
+def locate_items(endpoint, payload):
+    """Yield (source, items) for every product list the endpoint's locators find.
+
+    Falls back to the recursive search when none of the known shapes match.
+    """
+    if not isinstance(payload, dict):
+        return
+    found = False
+    for locator in endpoint.locators:
+        for source, items in locator(payload):
+            if items:
+                found = True
+                yield source, items
+        if found:
+            return
+    yield from locate_any(payload)
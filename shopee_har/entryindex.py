@@ -0,0 +1,170 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+import time
+
+from .archive import archive_kind
+from .decode import loads
+from .endpoints import match_endpoint
+from .extract import extract_entries, extract_frame, parse_entries
+from .metrics import collect_metrics, count, current_metrics, timed
+from .reader import iter_raw_har_entries
+
+# Naikkan jika isi index berubah; index lama dibangun ulang
+INDEX_VERSION = 2
+INDEX_SUFFIX = ".idx"
+INDEX_FIELDS = ["offset", "length", "url", "mime_type", "encoding", "body_size"]
+
+
+def index_path(path):
+    return os.fsdecode(path) + INDEX_SUFFIX
+
+
+def can_index(file):
+    """Only plain HARs on disk can be memory-mapped; uploads and archives are read as usual."""
+    return (isinstance(file, str) or hasattr(file, "__fspath__")) and archive_kind(os.fsdecode(file)) is None
+
+
+def build_entry_index(path):
+    """Scan a HAR once and return its entry index.
+
+    Every ``log.entries`` item gets its byte offset and length in the file,
+    request URL, response mimeType and encoding and the size of its body
+    text. The file's size and mtime are recorded so a changed HAR is
+    detected.
+    """
+    stat = os.stat(path)
+    entries = []
+    for offset, raw in iter_raw_har_entries(path, offsets=True):
+        entry = loads(raw)
+        request = entry.get("request") or {}
+        content = (entry.get("response") or {}).get("content") or {}
+        entries.append([offset, len(raw), request.get("url"), content.get("mimeType"), content.get("encoding"), len(content.get("text") or "")])
+    return {"version": INDEX_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "fields": INDEX_FIELDS, "entries": entries}
+
+
+def load_entry_index(path):
+    """The saved index of ``path``, or None when there is none or the HAR changed since."""
+    try:
+        with open(index_path(path), "rb") as fileobj:
+            index = loads(fileobj.read())
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION or index.get("size") != stat.st_size or index.get("mtime_ns") != stat.st_mtime_ns:
+        return None
+    return index
+
+
+def save_entry_index(path, index):
+    """Write the index next to the HAR; returns False when that directory is not writable."""
+    target = index_path(path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fileobj:
+            json.dump(index, fileobj, separators=(",", ":"))
+        os.replace(tmp_path, target)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def entry_index(path, rebuild=False):
+    """Load the index of ``path``, building and saving it first if it is missing or stale."""
+    index = None if rebuild else load_entry_index(path)
+    if index is not None:
+        count("index:hit")
+        return index
+    with timed("index_build"):
+        index = build_entry_index(path)
+    save_entry_index(path, index)
+    count("index:build")
+    return index
+
+
+def matching_entries(index, endpoints=None):
+    """Rows of the index whose URL and mimeType route to a product endpoint."""
+    rows = []
+    for row in index["entries"]:
+        # match_endpoint hanya melihat URL dan mimeType, jadi cukup entri tiruan dari index
+        stub = {"request": {"url": row[2]}, "response": {"content": {"mimeType": row[3]}}}
+        if match_endpoint(stub, endpoints) is not None:
+            rows.append(row)
+    return rows
+
+
+def iter_indexed_entries(path, rows, metrics):
+    """Yield the raw bytes of the given index rows, sliced from a memory map of the HAR."""
+    clock = time.perf_counter
+    with open(path, "rb") as fileobj, mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        for offset, length, *_ in rows:
+            started = clock()
+            raw = view[offset:offset + length]
+            metrics.timings["scan"] += clock() - started
+            metrics.counters["bytes:read"] += length
+            yield raw
+
+
+def extract_indexed_frame(file):
+    """``extract_frame`` that reads only the product entries of a plain HAR through its entry index.
+
+    The index is built on first use (a full scan, like a normal
+    extraction) and saved as ``<file>.idx``; later runs, e.g. after the
+    extracted fields change, parse nothing but the matching bodies. Other
+    inputs fall back to ``extract_frame``.
+    """
+    if not can_index(file) or not os.path.getsize(file):
+        return extract_frame(file)
+    with collect_metrics(current_metrics()) as metrics:
+        index = entry_index(file)
+        with timed("route_index"):
+            rows = matching_entries(index)
+        skipped = len(index["entries"]) - len(rows)
+        metrics.counters["entries"] += skipped
+        metrics.counters["skipped:unmatched"] += skipped
+        buffer = extract_entries(parse_entries(iter_indexed_entries(file, rows, metrics), metrics))
+        with timed("to_frame"):
+            return buffer.to_frame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m shopee_har.entryindex",
+        description="Build the byte-offset entry index (<file>.idx) of HAR files so later extractions read only product bodies.",
+    )
+    parser.add_argument("inputs", nargs="+", help="HAR files, directories or glob patterns (archives are skipped)")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild indexes that are still up to date")
+    args = parser.parse_args(argv)
+
+    # Impor di sini: cli mengimpor modul ini untuk --entry-index
+    from .cli import expand_inputs
+
+    failed = 0
+    for path in expand_inputs(args.inputs):
+        if not can_index(path):
+            continue
+        started = time.perf_counter()
+        try:
+            index = entry_index(path, args.rebuild)
+        except (OSError, ValueError) as e:
+            failed += 1
+            print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        rows = matching_entries(index)
+        body_bytes = sum(row[1] for row in rows)
+        print(
+            f"{path}: {len(index['entries'])} entries, {len(rows)} product entries, "
+            f"{body_bytes / max(index['size'], 1):.1%} of {index['size'] / (1 << 20):.1f} MB to read "
+            f"({time.perf_counter() - started:.2f}s)",
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import csv
+import io
+import sys
+
+import pandas as pd
+
+from .metrics import count, timed
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+EXCEL_MAX_ROWS = 1048576
+SHEET_NAME = "Shopee Data"
+
+
+def _plain(frame):
+    # Categorical -> object supaya skema sama antar potongan
+    frame = frame.copy(deep=False)
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(object)
+    return frame
+
+
+# format -> (label, mime type)
+EXPORT_FORMATS = {
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "text/csv"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.wrapped = hasattr(path, "write")
+        if path == "-":
+            self.fileobj = sys.stdout
+        elif self.wrapped:
+            self.fileobj = io.TextIOWrapper(path, encoding="utf-8", newline="")
+        else:
+            self.fileobj = open(path, "w", newline="", encoding="utf-8")
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.fileobj, header=self.header, index=False, quoting=csv.QUOTE_MINIMAL)
+        self.header = False
+
+    def close(self):
+        if self.wrapped:
+            # Jangan tutup buffer milik pemanggil
+            self.fileobj.flush()
+            self.fileobj.detach()
+        elif self.fileobj is not sys.stdout:
+            self.fileobj.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        if pa is None:
+            raise RuntimeError("Parquet output needs pyarrow")
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        frame = _plain(frame)
+        if self.writer is None:
+            schema = pa.Schema.from_pandas(frame, preserve_index=False)
+            schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in schema])
+            self.writer = pq.ParquetWriter(self.path, schema)
+        self.writer.write_table(pa.Table.from_pandas(frame, schema=self.writer.schema, preserve_index=False))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ExcelWriter:
+    """Row-streamed XLSX writer using xlsxwriter's constant_memory mode.
+
+    Rows past the Excel limit continue on a new sheet.
+    """
+
+    def __init__(self, path):
+        if xlsxwriter is None:
+            raise RuntimeError("Excel output needs XlsxWriter")
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "default_date_format": "yyyy-mm-dd"})
+        self.worksheet = None
+        self.sheets = 0
+        self.row = 0
+
+    def _new_sheet(self, columns):
+        self.sheets += 1
+        self.worksheet = self.workbook.add_worksheet(SHEET_NAME if self.sheets == 1 else f"{SHEET_NAME} {self.sheets}")
+        self.worksheet.write_row(0, 0, list(columns))
+        self.row = 1
+
+    def write(self, frame):
+        values = _plain(frame).astype(object)
+        values = values.where(frame.notna(), None)
+        if self.worksheet is None:
+            self._new_sheet(frame.columns)
+        for record in values.itertuples(index=False, name=None):
+            if self.row >= EXCEL_MAX_ROWS:
+                self._new_sheet(frame.columns)
+            self.worksheet.write_row(self.row, 0, record)
+            self.row += 1
+
+    def close(self):
+        if self.worksheet is None:
+            self.workbook.add_worksheet(SHEET_NAME)
+        self.workbook.close()
+
+
+def open_writer(path, fmt=None):
+    """Return a streaming writer for ``path`` (or a binary file object).
+
+    The format comes from ``fmt`` or the extension of ``path``.
+    """
+    fmt = fmt or ("csv" if path == "-" else path.rsplit(".", 1)[-1].lower())
+    if fmt == "csv":
+        return CsvWriter(path)
+    if fmt in ("parquet", "pq"):
+        return ParquetWriter(path)
+    if fmt == "xlsx":
+        return ExcelWriter(path)
+    raise ValueError(f"Unsupported output format: {fmt}")
+
+
+def export_bytes(frame, fmt, chunk_rows=50000, rows=None, columns=None):
+    """Write ``frame`` in the given format into memory, chunk by chunk, and return the bytes.
+
+    ``rows`` (positions) and ``columns`` select part of ``frame`` one chunk
+    at a time, so a filtered export never copies the whole selection.
+    """
+    output = io.BytesIO()
+    total = len(frame) if rows is None else len(rows)
+    with timed(f"export_{fmt}"):
+        writer = open_writer(output, fmt)
+        try:
+            for start in range(0, max(total, 1), chunk_rows):
+                chunk = frame.iloc[start:start + chunk_rows] if rows is None else frame.iloc[rows[start:start + chunk_rows]]
+                writer.write(chunk if columns is None else chunk[columns])
+        finally:
+            writer.close()
+    count(f"bytes:export_{fmt}", output.tell())
+    return output.getvalue()
+
@@ -0,0 +1,134 @@
+import binascii
+import io
+import time
+
+from .columns import ColumnBuffer
+from .decode import decode_content, loads
+from .endpoints import locate_items, match_endpoint
+from .metrics import Metrics, collect_metrics, current_metrics, timed
+from .progress import PUBLISH_ENTRIES, current_progress
+from .reader import iter_har_entries, iter_raw_har_entries
+from .shapes import SHAPE_STATS, iter_item_fields
+
+DECODE_ERRORS = (ValueError, binascii.Error, UnicodeDecodeError)
+
+
+def decode_body(content):
+    """Return the parsed JSON body of a HAR ``response.content``, or None."""
+    text = content.get("text")
+    if not text:
+        return None
+    try:
+        return decode_content(text, content.get("encoding"))
+    except DECODE_ERRORS:
+        return None
+
+
+def extract_entries(entries, buffer=None, stats=None):
+    """Append the products of the given HAR entries to a ColumnBuffer.
+
+    Routing, decoding and field extraction are timed and counted into the
+    current Metrics when one is being collected (see collect_metrics). When
+    a Progress is tracked (see track_progress), entry and item counts are
+    published to it every PUBLISH_ENTRIES entries, and a cancelled Progress
+    stops the loop with ExtractionCancelled.
+    """
+    if buffer is None:
+        buffer = ColumnBuffer(dedup=True)
+    metrics = current_metrics()
+    if stats is None:
+        stats = metrics.counters if metrics is not None else SHAPE_STATS
+    if metrics is None:
+        metrics = Metrics()
+    counters = metrics.counters
+    clock = time.perf_counter
+    route_time = decode_time = extract_time = 0.0
+    progress = current_progress()
+    seen = found_total = 0
+    for entry in entries:
+        counters["entries"] += 1
+        if progress is not None:
+            seen += 1
+            if seen == PUBLISH_ENTRIES:
+                progress.add(seen, found_total)
+                seen = found_total = 0
+                progress.check()
+        started = clock()
+        endpoint = match_endpoint(entry)
+        routed = clock()
+        route_time += routed - started
+        if endpoint is None:
+            counters["skipped:unmatched"] += 1
+            continue
+        counters[f"matched:{endpoint.name}"] += 1
+        content = entry.get("response", {}).get("content", {})
+        payload = decode_body(content)
+        decoded = clock()
+        decode_time += decoded - routed
+        if payload is None:
+            counters[f"skipped:undecodable:{endpoint.name}"] += 1
+            continue
+        counters["bytes:decoded"] += len(content.get("text") or "")
+        entry_started = entry.get("startedDateTime")
+        for source, items in locate_items(endpoint, payload):
+            found = 0
+            for fields in iter_item_fields(items, stats):
+                buffer.append(fields, source, entry_started)
+                found += 1
+            counters[f"items:{source}"] += found
+            found_total += found
+        extract_time += clock() - decoded
+    if progress is not None:
+        progress.add(seen, found_total)
+    metrics.timings["route"] += route_time
+    metrics.timings["decode"] += decode_time
+    metrics.timings["extract"] += extract_time
+    return buffer
+
+
+def scan_entries(raw_entries, metrics):
+    """Pass raw entries through, timing the scanner and counting their bytes."""
+    clock = time.perf_counter
+    iterator = iter(raw_entries)
+    while True:
+        started = clock()
+        raw = next(iterator, None)
+        metrics.timings["scan"] += clock() - started
+        if raw is None:
+            return
+        metrics.counters["bytes:read"] += len(raw)
+        yield raw
+
+
+def parse_entries(raw_entries, metrics):
+    clock = time.perf_counter
+    for raw in raw_entries:
+        started = clock()
+        entry = loads(raw)
+        metrics.timings["parse"] += clock() - started
+        yield entry
+
+
+def extract_raw_entries(raw_entries):
+    """Extract a chunk of raw entry bytes; used by the intra-file worker jobs.
+
+    Returns the ColumnBuffer and the chunk's Metrics.
+    """
+    with collect_metrics() as metrics:
+        return extract_entries(parse_entries(raw_entries, metrics)), metrics
+
+
+def extract_har(file, stats=None):
+    """Extract every product of one HAR (path, file object or bytes) into a ColumnBuffer."""
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        file = io.BytesIO(file)
+    metrics = current_metrics()
+    if metrics is None:
+        return extract_entries(iter_har_entries(file), stats=stats)
+    return extract_entries(parse_entries(scan_entries(iter_raw_har_entries(file), metrics), metrics), stats=stats)
+
+
+def extract_frame(file):
+    buffer = extract_har(file)
+    with timed("to_frame"):
+        return buffer.to_frame()
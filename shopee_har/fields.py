@@ -0,0 +1,42 @@
+import re
+from urllib.parse import quote
+
+def trim_name(name):
+    return " ".join(name.split()) if isinstance(name, str) else name
+
+def find_nested_value(data, path, default="N/A"):
+    keys = path.split(".")
+    for key in keys:
+        if isinstance(data, dict) and key in data:
+            data = data[key]
+        elif isinstance(data, list) and key.isdigit() and len(data) > int(key):
+            data = data[int(key)]
+        else:
+            return default
+    return data
+
+def find_value(data, keys, default="N/A"):
+    if isinstance(data, dict):
+        for key in keys:
+            if key in data:
+                return data[key]
+        for v in data.values():
+            result = find_value(v, keys, default)
+            if result != default:
+                return result
+    elif isinstance(data, list):
+        for item in data:
+            result = find_value(item, keys, default)
+            if result != default:
+                return result
+    return default
+
+def create_shopee_url(base_url: str, name: str, shopid: str, itemid: str) -> str:
+    if not all([base_url, name, shopid, itemid]):
+        return ""
+    
+    name_cleaned = re.sub(r"[^a-zA-Z0-9\s-]", "", name)
+    name_cleaned = name_cleaned.strip().lower().replace(" ", "-")
+    name_cleaned = re.sub(r"-{2,}", "-", name_cleaned)
+    
+    return f"{base_url.rstrip('/')}/{quote(name_cleaned)}-i.{shopid}.{itemid}"
@@ -0,0 +1,153 @@
+import datetime
+import os
+import sqlite3
+
+import pandas as pd
+
+DEFAULT_HISTORY_PATH = os.environ.get(
+    "SHOPEE_HAR_HISTORY", os.path.join(os.path.expanduser("~"), ".cache", "shopee_har", "history.sqlite")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS item_snapshots (
+    shopid INTEGER NOT NULL,
+    itemid INTEGER NOT NULL,
+    capture_date TEXT NOT NULL,
+    captured_at TEXT,
+    item_name TEXT,
+    shop_name TEXT,
+    shop_location TEXT,
+    price REAL,
+    sold_30_days INTEGER,
+    historical_sold INTEGER,
+    rating_star REAL,
+    rating_count INTEGER,
+    source TEXT,
+    PRIMARY KEY (shopid, itemid, capture_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_item ON item_snapshots (itemid, capture_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_shop_name ON item_snapshots (shop_name);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    har_hash TEXT PRIMARY KEY,
+    name TEXT,
+    ingested_at TEXT,
+    rows INTEGER
+);
+"""
+
+_SNAPSHOT_COLUMNS = [
+    "shopid", "itemid", "capture_date", "captured_at", "item_name", "shop_name", "shop_location",
+    "price", "sold_30_days", "historical_sold", "rating_star", "rating_count", "source",
+]
+
+# Satu snapshot per item per hari; capture yang lebih baru di hari yang sama menggantikan
+_UPSERT = f"""
+INSERT INTO item_snapshots ({", ".join(_SNAPSHOT_COLUMNS)})
+VALUES ({", ".join("?" * len(_SNAPSHOT_COLUMNS))})
+ON CONFLICT (shopid, itemid, capture_date) DO UPDATE SET
+    {", ".join(f"{column} = excluded.{column}" for column in _SNAPSHOT_COLUMNS[3:])}
+WHERE excluded.captured_at > item_snapshots.captured_at
+"""
+
+
+class SnapshotStore:
+    """Local SQLite store of item snapshots keyed by (shopid, itemid, capture date).
+
+    HARs are recorded by content hash (``cache.hash_content``), so ingesting
+    the same capture twice is a no-op and only new snapshots are written.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def has_file(self, har_hash):
+        row = self.connection.execute("SELECT 1 FROM ingested_files WHERE har_hash = ?", (har_hash,)).fetchone()
+        return row is not None
+
+    def add_frame(self, frame, har_hash=None, name=None):
+        """Insert the snapshots of an extracted frame and return how many rows changed.
+
+        ``frame`` may be None for a HAR without products; it is still recorded
+        as ingested.
+        """
+        if har_hash is not None and self.has_file(har_hash):
+            return 0
+        rows = _snapshot_rows(frame) if frame is not None else []
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(_UPSERT, rows)
+            changed = self.connection.total_changes - before
+            if har_hash is not None:
+                self.connection.execute(
+                    "INSERT INTO ingested_files VALUES (?, ?, ?, ?)",
+                    (har_hash, name, datetime.datetime.now().isoformat(timespec="seconds"), changed),
+                )
+        return changed
+
+    def _query(self, sql, params=()):
+        return pd.read_sql_query(sql, self.connection, params=params, parse_dates=["capture_date"])
+
+    def item_history(self, itemid, shopid=None):
+        sql = "SELECT * FROM item_snapshots WHERE itemid = ?"
+        params = [itemid]
+        if shopid is not None:
+            sql += " AND shopid = ?"
+            params.append(shopid)
+        return self._query(sql + " ORDER BY capture_date", params)
+
+    def shop_history(self, shopid=None, shop_name=None):
+        if shopid is not None:
+            return self._query("SELECT * FROM item_snapshots WHERE shopid = ? ORDER BY itemid, capture_date", [shopid])
+        return self._query("SELECT * FROM item_snapshots WHERE shop_name = ? ORDER BY itemid, capture_date", [shop_name])
+
+    def sales_velocity(self, start=None, end=None, shopid=None, limit=None):
+        """Sold units per day between each item's first and last snapshot in [start, end]."""
+        filters = ["capture_date >= ?", "capture_date <= ?"]
+        params = [str(start or "0000-00-00"), str(end or "9999-12-31")]
+        if shopid is not None:
+            filters.append("shopid = ?")
+            params.append(shopid)
+        sql = f"""
+            WITH bounds AS (
+                SELECT shopid, itemid, MIN(capture_date) AS first_date, MAX(capture_date) AS last_date
+                FROM item_snapshots
+                WHERE {" AND ".join(filters)}
+                GROUP BY shopid, itemid
+                HAVING first_date < last_date
+            )
+            SELECT b.shopid, b.itemid, l.item_name, l.shop_name, b.first_date, b.last_date,
+                   l.historical_sold - f.historical_sold AS sold_delta,
+                   (l.historical_sold - f.historical_sold) / (julianday(b.last_date) - julianday(b.first_date)) AS sold_per_day,
+                   l.sold_30_days
+            FROM bounds b
+            JOIN item_snapshots f ON f.shopid = b.shopid AND f.itemid = b.itemid AND f.capture_date = b.first_date
+            JOIN item_snapshots l ON l.shopid = b.shopid AND l.itemid = b.itemid AND l.capture_date = b.last_date
+            ORDER BY sold_per_day DESC
+        """
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return pd.read_sql_query(sql, self.connection, params=params, parse_dates=["first_date", "last_date"])
+
+
+def _snapshot_rows(frame):
+    frame = frame[frame["shopid"].notna() & frame["itemid"].notna()]
+    captured = frame["last_update"]
+    today = datetime.date.today().isoformat()
+    capture_date = captured.dt.strftime("%Y-%m-%d").fillna(today)
+    captured_at = captured.dt.strftime("%Y-%m-%dT%H:%M:%S").fillna(today)
+    columns = [
+        frame["shopid"], frame["itemid"], capture_date, captured_at, frame["item_name"],
+        frame["shop_name"], frame["shop_location"], frame["price"], frame["sold_30_days"],
+        frame["historical_sold"], frame["rating_star"], frame["rating_count"], frame["source"],
+    ]
+    values = [column.astype(object).where(column.notna(), None).tolist() for column in columns]
+    return zip(*values)
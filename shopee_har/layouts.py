@@ -0,0 +1,43 @@
+from .columns import ColumnBuffer, concat_frames, drop_duplicate_items
+from .extract import extract_frame
+from .metrics import timed
+
+# Kolom extract-data-shopee.py
+EXTRACT_COLUMNS = [
+    "item_name", "price", "sold_30_days", "historical_sold", "shopee_url", "shop_name",
+    "is_sold_out", "itemid", "shopid", "upload_date", "rating_star", "rating_count",
+]
+
+# Kolom fix-extract-data-shopee (kelompok Aktif / Tidak Aktif / Produk Serupa)
+GROUPED_RENAMES = {"last_update": "last update", "upload_date": "upload", "shopee_url": "url"}
+GROUPED_COLUMNS = [
+    "source", "sources", "last update", "upload", "shopid", "itemid", "item_name", "price", "sold_30_days",
+    "historical_sold", "url", "rating_star", "rating_count", "shop_name", "shop_rating", "shop_location",
+]
+
+
+def extract_layout(frame):
+    return frame[EXTRACT_COLUMNS]
+
+def grouped_layout(frame):
+    return frame.rename(columns=GROUPED_RENAMES).reindex(columns=GROUPED_COLUMNS)
+
+def full_layout(frame):
+    return frame
+
+LAYOUTS = {"full": full_layout, "extract": extract_layout, "grouped": grouped_layout}
+
+
+def ekstrak_dan_simpan_data(file):
+    """Extract one HAR with the extract-data-shopee.py columns; None when it has no products."""
+    frame = extract_frame(file)
+    with timed("layout"):
+        return extract_layout(frame) if not frame.empty else None
+
+def process_har_files(har_files):
+    """Extract several HARs into one frame grouped by source, as fix-extract-data-shopee does."""
+    frames = [extract_frame(har_file) for har_file in har_files]
+    with timed("dedup"):
+        frame = drop_duplicate_items(concat_frames(frames)) if frames else ColumnBuffer().to_frame()
+    with timed("layout"):
+        return grouped_layout(frame)
@@ -0,0 +1,104 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("shopee_har_metrics", default=None)
+
+
+class Metrics:
+    """Stage timings (seconds) and counters of one extraction or UI run.
+
+    Counter keys follow the SHAPE_STATS convention ``<kind>:<detail>``:
+    ``entries``, ``bytes:read``, ``bytes:decoded``, ``matched:<endpoint>``,
+    ``skipped:unmatched``, ``skipped:undecodable:<endpoint>``,
+    ``items:<source>``, ``shape:<shape>``, ``fallback:<shape>.<field>``,
+    ``cache:hit`` / ``cache:miss`` and ``files`` / ``errors``.
+    """
+
+    def __init__(self, timings=None, counters=None):
+        self.timings = Counter(timings or {})
+        self.counters = Counter(counters or {})
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] += time.perf_counter() - started
+
+    def merge(self, other):
+        if other is not None:
+            self.timings.update(other.timings)
+            self.counters.update(other.counters)
+        return self
+
+    def to_dict(self):
+        return {
+            "timings": {name: round(seconds, 6) for name, seconds in sorted(self.timings.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def __repr__(self):
+        return f"Metrics({self.to_dict()})"
+
+
+def current_metrics():
+    """Return the Metrics being collected in this context, or None."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def collect_metrics(metrics=None):
+    """Collect the metrics of everything run inside the block into ``metrics``."""
+    metrics = metrics if metrics is not None else Metrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def timed(name):
+    """Time a stage into the current Metrics; does nothing when none is being collected."""
+    metrics = _current.get()
+    if metrics is None:
+        yield None
+        return
+    with metrics.stage(name):
+        yield metrics
+
+
+def count(key, value=1):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.counters[key] += value
+
+
+def log_metrics(event, metrics, **fields):
+    """Log one structured JSON record with the metrics and any extra fields."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({"event": event, **fields, **metrics.to_dict()}, default=str, ensure_ascii=False))
+
+
+def configure_metrics_log(path):
+    """Write metrics records as JSON lines to ``path`` ("-" for stderr)."""
+    if any(getattr(handler, "_shopee_har_path", None) == path for handler in logger.handlers):
+        return
+    handler = logging.StreamHandler() if path == "-" else logging.FileHandler(path, encoding="utf-8")
+    handler._shopee_har_path = path
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+# SHOPEE_HAR_METRICS_LOG=path menyalakan log JSON untuk monitoring
+if os.environ.get("SHOPEE_HAR_METRICS_LOG"):
+    configure_metrics_log(os.environ["SHOPEE_HAR_METRICS_LOG"])
@@ -0,0 +1,31 @@
+import numpy as np
+
+PAGE_SIZES = [25, 50, 100, 250, 1000]
+
+
+def sort_rows(frame, column, ascending=True, rows=None):
+    """Positional row ids of ``frame`` ordered by ``column``, missing values last.
+
+    ``rows`` restricts the result to a filtered subset (sorted positional
+    ids, as returned by SearchIndex.filter_rows). Only the sort column is
+    touched; the frame itself is never reordered or copied.
+    """
+    values = frame[column]
+    positions = np.arange(len(frame))
+    if rows is not None:
+        values = values.iloc[rows]
+        positions = rows
+    order = values.reset_index(drop=True).sort_values(ascending=ascending, kind="stable", na_position="last").index
+    return positions[order.to_numpy()]
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
+
+
+def page_frame(frame, page, page_size, order=None):
+    """Materialize one page (1-based) of ``frame`` in ``order``; None keeps the frame order."""
+    start = (page - 1) * page_size
+    if order is None:
+        return frame.iloc[start:start + page_size]
+    return frame.iloc[order[start:start + page_size]]
@@ -0,0 +1,265 @@
+import multiprocessing
+import os
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from .archive import ArchiveMember, detach_member
+from .cache import hash_har
+from .columns import ColumnBuffer
+from .decode import active_backend, select_backend
+from .extract import extract_frame, extract_raw_entries, scan_entries
+from .metrics import Metrics, collect_metrics, current_metrics, timed
+from .progress import current_progress
+from .reader import iter_raw_har_entries
+from .shapes import SHAPE_STATS
+
+# Hasil per file: frame None jika tidak ada produk, error berisi pesan jika gagal,
+# metrics berisi waktu per tahap dan penghitung file itu
+# key: hash_har isi file (None jika cache tidak dipakai)
+FileResult = namedtuple("FileResult", ["name", "frame", "error", "metrics", "key"], defaults=[None, None])
+
+# File di atas batas ini dipecah per potongan entries dan diproses paralel
+SPLIT_BYTES = int(os.environ.get("SHOPEE_HAR_SPLIT_BYTES", 64 * 1024 * 1024))
+CHUNK_BYTES = 8 * 1024 * 1024
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def default_workers():
+    workers = os.environ.get("SHOPEE_HAR_WORKERS")
+    return max(1, int(workers)) if workers else (os.cpu_count() or 1)
+
+
+def get_pool(max_workers=None):
+    """Return a process pool shared by every caller in this process.
+
+    Workers are spawned rather than forked, since the Streamlit server is
+    multi-threaded.
+    """
+    global _pool, _pool_workers
+    max_workers = max_workers or default_workers()
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Worker memakai backend decode yang sama dengan proses utama, tanpa benchmark ulang
+            backend = active_backend()
+            _pool = ProcessPoolExecutor(
+                max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=select_backend,
+                initargs=(backend.json, backend.base64),
+            )
+            _pool_workers = max_workers
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _file_name(file):
+    if isinstance(file, ArchiveMember):
+        return file.name
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        return os.fsdecode(file)
+    return getattr(file, "name", "<upload>")
+
+
+def _job_source(file):
+    # Path dikirim apa adanya; file upload dikirim sebagai bytes karena tidak bisa di-pickle
+    if isinstance(file, ArchiveMember):
+        member = detach_member(file)
+        return member if isinstance(member.source, bytes) else member._replace(source=_job_source(member.source))
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        return os.fsdecode(file)
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    data = file.read()
+    file.seek(0)
+    return data
+
+
+def _file_size(file):
+    if isinstance(file, ArchiveMember):
+        return file.size
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        return os.path.getsize(file)
+    if hasattr(file, "getbuffer"):
+        return file.getbuffer().nbytes
+    return getattr(file, "size", 0) or 0
+
+
+def _run(extract, source):
+    with collect_metrics() as metrics:
+        try:
+            return extract(source), None, metrics
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}", metrics
+
+
+def _merge_chunk(buffer, result, metrics, progress):
+    chunk, chunk_metrics = result
+    buffer.extend(chunk)
+    if progress is not None:
+        progress.add_counters(chunk_metrics.counters)
+    if metrics is not None:
+        metrics.merge(chunk_metrics)
+    else:
+        _add_shape_stats(chunk_metrics)
+
+
+def _add_shape_stats(metrics):
+    # Hitungan bentuk dari worker dipindahkan ke SHAPE_STATS proses utama
+    SHAPE_STATS.update({key: value for key, value in metrics.counters.items() if key.startswith(("shape:", "fallback:"))})
+
+
+def extract_har_parallel(file, max_workers=None, chunk_bytes=CHUNK_BYTES):
+    """Extract one large HAR by fanning chunks of its entries out to the pool.
+
+    The parent only finds entry boundaries; JSON parsing, base64 decoding
+    and item extraction run in the workers, which send back ColumnBuffers.
+    At most two chunks per worker are in flight, and chunks are merged in
+    file order. The workers' metrics are merged into the current Metrics,
+    and each merged chunk is published to the current Progress, whose
+    cancellation is checked between chunks.
+    """
+    max_workers = max_workers or default_workers()
+    pool = get_pool(max_workers)
+    metrics = current_metrics()
+    progress = current_progress()
+    buffer = ColumnBuffer(dedup=True)
+    in_flight = deque()
+    batch, batch_bytes = [], 0
+    raw_entries = iter_raw_har_entries(file)
+    if metrics is not None:
+        raw_entries = scan_entries(raw_entries, metrics)
+    try:
+        for raw in raw_entries:
+            batch.append(raw)
+            batch_bytes += len(raw)
+            if batch_bytes < chunk_bytes:
+                continue
+            if progress is not None:
+                progress.check()
+            in_flight.append(pool.submit(extract_raw_entries, batch))
+            batch, batch_bytes = [], 0
+            while len(in_flight) >= 2 * max_workers:
+                _merge_chunk(buffer, in_flight.popleft().result(), metrics, progress)
+        if batch:
+            in_flight.append(pool.submit(extract_raw_entries, batch))
+        while in_flight:
+            if progress is not None:
+                progress.check()
+            _merge_chunk(buffer, in_flight.popleft().result(), metrics, progress)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+    finally:
+        for future in in_flight:
+            future.cancel()
+    return buffer
+
+
+def _extract_split(file, max_workers):
+    buffer = extract_har_parallel(file, max_workers)
+    with timed("to_frame"):
+        return buffer.to_frame()
+
+
+def iter_extract_files(files, cache=None, max_workers=None, extract=extract_frame):
+    """Extract several HARs in a process pool, yielding FileResults in input order.
+
+    ``extract`` must be a picklable top-level function. Files already in
+    ``cache`` (a ResultCache) are not sent to the pool. With the default
+    extractor, files larger than SPLIT_BYTES are split across the workers
+    with extract_har_parallel. At most two files per worker are in flight,
+    so results can be consumed while later files are still running. An
+    exception in one file is reported in its FileResult and does not
+    affect the others. Each FileResult carries the file's Metrics, which
+    are also merged into the current Metrics when one is being collected.
+    Closing the generator early cancels the pool jobs that have not started.
+    """
+    files = list(files)
+    max_workers = max_workers or default_workers()
+    inline = max_workers == 1 or len(files) == 1
+    in_flight = deque()
+    try:
+        for file in files:
+            metrics = Metrics()
+            key = frame = None
+            if cache is not None:
+                with metrics.stage("hash"):
+                    key = hash_har(file)
+                with metrics.stage("cache_read"):
+                    frame = cache.get(key)
+                metrics.counters["cache:hit" if frame is not None else "cache:miss"] += 1
+            if frame is not None:
+                in_flight.append((file, key, metrics, (frame, None, None)))
+            elif extract is extract_frame and not max_workers == 1 and _file_size(file) > SPLIT_BYTES:
+                # File besar dipecah di proses utama sementara file lain dikerjakan worker
+                try:
+                    in_flight.append((file, key, metrics, _run(lambda source: _extract_split(source, max_workers), file)))
+                finally:
+                    _rewind(file)
+            elif inline:
+                in_flight.append((file, key, metrics, _run(extract, file)))
+            else:
+                in_flight.append((file, key, metrics, get_pool(max_workers).submit(_run, extract, _job_source(file))))
+            while in_flight and (len(in_flight) > 2 * max_workers or not isinstance(in_flight[0][3], Future) or in_flight[0][3].done()):
+                yield _finish(cache, *in_flight.popleft())
+        while in_flight:
+            yield _finish(cache, *in_flight.popleft())
+    finally:
+        # Generator ditutup lebih awal (mis. ekstraksi dibatalkan): job yang belum mulai tidak dijalankan
+        for _, _, _, outcome in in_flight:
+            if isinstance(outcome, Future):
+                outcome.cancel()
+
+
+def extract_files(files, cache=None, max_workers=None, extract=extract_frame):
+    """Extract several HARs and return their FileResults in input order."""
+    return list(iter_extract_files(files, cache, max_workers, extract))
+
+
+def _finish(cache, file, key, metrics, outcome):
+    # key None berarti cache tidak dipakai
+    if isinstance(outcome, Future):
+        try:
+            outcome = outcome.result()
+        except BrokenProcessPool as e:
+            # Worker mati (mis. kehabisan memori): buat pool baru untuk panggilan berikutnya
+            if _pool is not None:
+                _discard_pool(_pool)
+            outcome = (None, f"{type(e).__name__}: {e}", None)
+        # Worker tidak melihat Progress proses utama: entri file utuh dihitung saat selesai
+        progress = current_progress()
+        if progress is not None and outcome[2] is not None:
+            progress.add_counters(outcome[2].counters)
+    frame, error, run_metrics = outcome
+    metrics.merge(run_metrics)
+    if error is None and key is not None and not metrics.counters["cache:hit"]:
+        with metrics.stage("cache_write"):
+            cache.put(key, frame if frame is not None else pd.DataFrame())
+    metrics.counters["files"] += 1
+    metrics.counters["errors"] += error is not None
+    _add_shape_stats(metrics)
+    parent = current_metrics()
+    if parent is not None:
+        parent.merge(metrics)
+    return FileResult(_file_name(file), frame if frame is not None and not frame.empty else None, error, metrics, key)
+
+
+def _rewind(file):
+    if hasattr(file, "seek"):
+        file.seek(0)
@@ -0,0 +1,62 @@
+import contextlib
+import contextvars
+import threading
+
+_current = contextvars.ContextVar("shopee_har_progress", default=None)
+
+# Jumlah entri per pembaruan progres (dan per cek pembatalan) saat ekstraksi berjalan
+PUBLISH_ENTRIES = 256
+
+
+class ExtractionCancelled(Exception):
+    """Raised inside a running extraction once its Progress was cancelled."""
+
+
+class Progress:
+    """Live entry and item counts of a running extraction, plus its cancel flag.
+
+    Unlike Metrics, which are merged when a file finishes, the counts here
+    move while a file is still being read: inline extraction publishes
+    every PUBLISH_ENTRIES entries and a split file every merged chunk. A
+    file extracted whole in a worker process is counted when it finishes.
+    """
+
+    def __init__(self):
+        self.entries = 0
+        self.items = 0
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def add(self, entries=0, items=0):
+        with self._lock:
+            self.entries += entries
+            self.items += items
+
+    def add_counters(self, counters):
+        self.add(counters["entries"], sum(value for key, value in counters.items() if key.startswith("items:")))
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise ExtractionCancelled("extraction cancelled")
+
+
+def current_progress():
+    """Return the Progress being tracked in this context, or None."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def track_progress(progress):
+    """Publish the progress of every extraction run inside the block into ``progress``."""
+    token = _current.set(progress)
+    try:
+        yield progress
+    finally:
+        _current.reset(token)
@@ -0,0 +1,216 @@
+import json
+import re
+
+from .archive import ArchiveMember, open_member
+from .decode import loads
+
+# Karakter struktural JSON yang perlu diperhatikan saat memindai nilai object/array
+_STRUCT = re.compile(rb'[{}\[\]"]')
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+_WHITESPACE = b" \t\r\n"
+
+
+class _JsonScanner:
+    """Buffered byte scanner over a JSON document.
+
+    Only the value currently being scanned is kept in memory; everything
+    before it is released with ``release()``. ``offset`` is the file
+    position of ``buf[0]``.
+    """
+
+    def __init__(self, fileobj, chunk_size):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.buf = bytearray()
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self.started = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.fileobj.read(self.chunk_size)
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if not chunk:
+            self.eof = True
+            return False
+        if not self.started:
+            self.started = True
+            # BOM bisa terpotong jika chunk lebih kecil dari 3 byte
+            while len(chunk) < 3:
+                more = self.fileobj.read(self.chunk_size)
+                if not more:
+                    break
+                chunk += more.encode("utf-8") if isinstance(more, str) else more
+            if chunk.startswith(b"\xef\xbb\xbf"):
+                chunk = chunk[3:]
+                self.offset = 3
+        self.buf += chunk
+        return True
+
+    def release(self):
+        self.offset += self.pos
+        del self.buf[:self.pos]
+        self.pos = 0
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            self.release()
+            if not self._fill():
+                raise ValueError("Unexpected end of HAR file")
+
+    def expect(self, token):
+        found = self.peek()
+        if found != token:
+            raise ValueError(f"Expected {token!r} at byte {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def read_string(self):
+        raw = self.read_value()
+        if not raw.startswith(b'"'):
+            raise ValueError(f"Expected string at byte {self.pos}")
+        return json.loads(raw)
+
+    def _string_end(self, i):
+        # i menunjuk ke karakter setelah tanda kutip pembuka
+        while True:
+            j = self.buf.find(b'"', i)
+            if j < 0:
+                i = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Unterminated string in HAR file")
+                continue
+            backslashes = 0
+            k = j - 1
+            while self.buf[k] == 0x5C:
+                backslashes += 1
+                k -= 1
+            if backslashes % 2 == 0:
+                return j + 1
+            i = j + 1
+
+    def _container_end(self, i):
+        depth = 0
+        while True:
+            m = _STRUCT.search(self.buf, i)
+            if m is None:
+                i = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Unexpected end of HAR file")
+                continue
+            ch = m.group()
+            if ch == b'"':
+                i = self._string_end(m.end())
+            elif ch in (b"{", b"["):
+                depth += 1
+                i = m.end()
+            else:
+                depth -= 1
+                i = m.end()
+                if depth == 0:
+                    return i
+
+    def _scalar_end(self, i):
+        while True:
+            m = _SCALAR_END.search(self.buf, i)
+            if m is not None:
+                return m.start()
+            i = len(self.buf)
+            if not self._fill():
+                return i
+
+    def read_value(self):
+        """Return the raw bytes of the next JSON value and advance past it."""
+        first = self.peek()
+        start = self.pos
+        if first in (b"{", b"["):
+            end = self._container_end(start)
+        elif first == b'"':
+            end = self._string_end(start + 1)
+        else:
+            end = self._scalar_end(start)
+        self.pos = end
+        return bytes(self.buf[start:end])
+
+    def skip_value(self):
+        self.read_value()
+        self.release()
+
+    def iter_object_keys(self):
+        """Yield the keys of the object being read; the caller consumes each value."""
+        self.expect(b"{")
+        if self.peek() == b"}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(b":")
+            yield key
+            token = self.peek()
+            self.pos += 1
+            if token == b"}":
+                return
+            if token != b",":
+                raise ValueError(f"Expected ',' or '}}' at byte {self.pos - 1}, found {token!r}")
+
+    def iter_array_values(self, offsets=False):
+        """Yield the raw bytes of every value of the array being read; with ``offsets``, (file offset, raw bytes)."""
+        self.expect(b"[")
+        if self.peek() == b"]":
+            self.pos += 1
+            return
+        while True:
+            # peek dulu: offset harus menunjuk ke awal nilai, bukan ke spasi setelah koma
+            self.peek()
+            start = self.offset + self.pos
+            raw = self.read_value()
+            self.release()
+            yield (start, raw) if offsets else raw
+            token = self.peek()
+            self.pos += 1
+            if token == b"]":
+                return
+            if token != b",":
+                raise ValueError(f"Expected ',' or ']' at byte {self.pos - 1}, found {token!r}")
+
+
+def iter_raw_har_entries(file, chunk_size=1 << 20, offsets=False):
+    """Yield the raw JSON bytes of every ``log.entries`` item without parsing it.
+
+    ``file`` is a path, a binary/text file object (e.g. a Streamlit
+    ``UploadedFile``) or an ArchiveMember, which is decompressed as it is
+    read. Memory use is bounded by the largest single entry instead of the
+    size of the whole file. With ``offsets``, (byte offset, raw bytes)
+    pairs are yielded; offsets are only meaningful for binary input.
+    """
+    if isinstance(file, ArchiveMember):
+        with open_member(file) as fileobj:
+            yield from iter_raw_har_entries(fileobj, chunk_size, offsets)
+        return
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        with open(file, "rb") as fileobj:
+            yield from iter_raw_har_entries(fileobj, chunk_size, offsets)
+        return
+
+    scanner = _JsonScanner(file, chunk_size)
+    for key in scanner.iter_object_keys():
+        if key != "log":
+            scanner.skip_value()
+            continue
+        for log_key in scanner.iter_object_keys():
+            if log_key != "entries":
+                scanner.skip_value()
+                continue
+            yield from scanner.iter_array_values(offsets)
+
+
+def iter_har_entries(file, chunk_size=1 << 20):
+    """Yield ``log.entries`` of a HAR file one parsed entry at a time."""
+    for raw in iter_raw_har_entries(file, chunk_size):
+        yield loads(raw)
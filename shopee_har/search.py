@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_text(value):
+    return " ".join(value.casefold().split()) if isinstance(value, str) else ""
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TextIndex:
+    """Trigram index over the distinct values of one text column.
+
+    Rows are mapped to distinct values once (``pd.factorize``); a query is
+    answered on the distinct values and expanded back to rows with a
+    single vectorized lookup.
+    """
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object).map(normalize_text))
+        self.codes = codes
+        self.values = list(uniques)
+        postings = defaultdict(list)
+        for value_id, text in enumerate(self.values):
+            for trigram in _trigrams(text):
+                postings[trigram].append(value_id)
+        self.postings = {trigram: np.array(ids, dtype=np.int64) for trigram, ids in postings.items()}
+
+    def _match_term(self, term):
+        if len(term) < 3:
+            return np.array([value_id for value_id, text in enumerate(self.values) if term in text], dtype=np.int64)
+        candidates = None
+        for trigram in _trigrams(term):
+            ids = self.postings.get(trigram)
+            if ids is None:
+                return np.empty(0, dtype=np.int64)
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+        # Trigram cocok belum tentu substring; cek ulang pada kandidat
+        return np.array([value_id for value_id in candidates if term in self.values[value_id]], dtype=np.int64)
+
+    def _match(self, query):
+        # None berarti query kosong (tidak memfilter)
+        matched = None
+        for term in normalize_text(query).split():
+            ids = self._match_term(term)
+            matched = ids if matched is None else np.intersect1d(matched, ids, assume_unique=True)
+            if not len(matched):
+                break
+        return matched
+
+    def search(self, query):
+        """Row ids whose value contains every whitespace-separated term of ``query``."""
+        matched = self._match(query)
+        if matched is None:
+            return np.arange(len(self.codes))
+        mask = np.zeros(len(self.values), dtype=bool)
+        mask[matched] = True
+        return np.flatnonzero(mask[self.codes])
+
+    def suggestions(self, query, limit=20):
+        """Distinct normalized values matching ``query``, for showing what a query hits."""
+        matched = self._match(query)
+        return [] if matched is None else [self.values[value_id] for value_id in matched[:limit]]
+
+
+class SearchIndex:
+    """Keyword indexes over several text columns of one dataset."""
+
+    def __init__(self, frame, columns=("item_name", "shop_name")):
+        self.frame = frame
+        self.indexes = {column: TextIndex(frame[column]) for column in columns}
+
+    def filter_rows(self, queries=None, values=None):
+        """Resolve filters to sorted positional row ids; None means no filter is active.
+
+        ``queries`` maps an indexed column to a keyword query and
+        ``values`` maps any column to a list of accepted values.
+        """
+        row_sets = []
+        for column, query in (queries or {}).items():
+            if query and query.strip():
+                row_sets.append(self.indexes[column].search(query))
+        for column, accepted in (values or {}).items():
+            if accepted:
+                row_sets.append(np.flatnonzero(self.frame[column].isin(accepted).to_numpy()))
+        return intersect_rows(row_sets)
+
+
+def intersect_rows(row_sets):
+    rows = None
+    for row_set in row_sets:
+        rows = row_set if rows is None else np.intersect1d(rows, row_set, assume_unique=True)
+    return rows
@@ -0,0 +1,166 @@
+import logging
+from collections import Counter, namedtuple
+
+from .fields import find_value
+
+logger = logging.getLogger(__name__)
+
+# Jumlah item per bentuk dan jumlah field yang jatuh ke pencarian rekursif.
+# Kunci: "shape:<nama>" dan "fallback:<nama>.<field>".
+SHAPE_STATS = Counter()
+
+_MISSING = object()
+
+# Kunci pencarian rekursif per field, sama dengan pemanggilan find_value lama
+FALLBACK_KEYS = {
+    "itemid": ["itemid"],
+    "shopid": ["shopid"],
+    "name": ["name"],
+    "price": ["price"],
+    "shop_name": ["shop_name"],
+    "rating_star": ["rating_star"],
+    "rating_count": ["rating_count"],
+    "historical_sold": ["historical_sold_count", "historical_sold"],
+    "monthly_sold": ["monthly_sold_count", "sold"],
+    "ctime": ["ctime"],
+    "is_sold_out": ["is_sold_out"],
+    "shop_rating": ["shop_rating"],
+    "shop_location": ["shop_location"],
+}
+
+FIELDS = tuple(FALLBACK_KEYS)
+
+Shape = namedtuple("Shape", ["name", "accessor"])
+
+
+def _compile_path(path):
+    if len(path) == 1:
+        key = path[0]
+        return lambda item: item.get(key, _MISSING)
+    if len(path) == 2:
+        outer, inner = path
+        def get(item):
+            value = item.get(outer)
+            return value.get(inner, _MISSING) if isinstance(value, dict) else _MISSING
+        return get
+    def get(item):
+        for key in path:
+            if not isinstance(item, dict):
+                return _MISSING
+            item = item.get(key, _MISSING)
+            if item is _MISSING:
+                return _MISSING
+        return item
+    return get
+
+
+def compile_shape(name, paths):
+    """Build an accessor that reads every field through fixed key paths.
+
+    ``paths`` maps a field name to a list of key paths tried in order.
+    Fields not listed are not part of the shape and come back as None;
+    listed fields whose paths all miss are looked up with the recursive
+    find_value and counted in the stats as schema drift.
+    """
+    getters = tuple(
+        (field, tuple(_compile_path(tuple(path)) for path in paths[field]), FALLBACK_KEYS[field], f"fallback:{name}.{field}")
+        for field in FIELDS if field in paths
+    )
+    shape_key = f"shape:{name}"
+
+    def accessor(item, stats):
+        stats[shape_key] += 1
+        row = dict.fromkeys(FIELDS)
+        for field, field_getters, fallback_keys, fallback_key in getters:
+            for get in field_getters:
+                value = get(item)
+                if value is not _MISSING:
+                    row[field] = value
+                    break
+            else:
+                stats[fallback_key] += 1
+                row[field] = find_value(item, fallback_keys, None)
+        return row
+
+    return Shape(name, accessor)
+
+
+def _recursive_accessor(item, stats):
+    stats["shape:unknown"] += 1
+    stats["fallback:unknown"] += 1
+    row = {field: find_value(item, keys, None) for field, keys in FALLBACK_KEYS.items()}
+    for path in ("item_card_displayed_asset", "item_basic"):
+        nested = item.get(path)
+        if isinstance(nested, dict) and "name" in nested:
+            row["name"] = nested["name"]
+            break
+    return row
+
+
+_FLAT_PATHS = {
+    "itemid": [["itemid"]],
+    "shopid": [["shopid"]],
+    "name": [["name"]],
+    "price": [["price"]],
+    "shop_name": [["shop_name"]],
+    "rating_star": [["item_rating", "rating_star"], ["rating_star"]],
+    "rating_count": [["item_rating", "rating_count"]],
+    "historical_sold": [["historical_sold"], ["historical_sold_count"]],
+    "monthly_sold": [["sold"], ["monthly_sold_count"]],
+    "ctime": [["ctime"]],
+    "shop_rating": [["shop_rating"]],
+    "shop_location": [["shop_location"]],
+    "is_sold_out": [["is_sold_out"]],
+}
+
+# Bentuk respons yang dikenal
+FLAT = compile_shape("flat", _FLAT_PATHS)
+ITEM_BASIC = compile_shape("item_basic", {
+    field: [["item_basic"] + path for path in field_paths] + ([[field]] if field in ("itemid", "shopid") else [])
+    for field, field_paths in _FLAT_PATHS.items()
+})
+ITEM_CARD = compile_shape("item_card", {
+    "itemid": [["itemid"]],
+    "shopid": [["shopid"]],
+    "name": [["item_card_displayed_asset", "name"]],
+    "price": [["item_card_display_price", "price"], ["price"]],
+    "shop_name": [["shop_data", "shop_name"], ["shop_name"]],
+    "rating_star": [["item_card_display_rating", "rating_star"], ["item_rating", "rating_star"]],
+    "rating_count": [["item_card_display_rating", "rating_count"], ["item_rating", "rating_count"]],
+    "historical_sold": [["item_card_display_sold_count", "historical_sold_count"], ["historical_sold"]],
+    "monthly_sold": [["item_card_display_sold_count", "monthly_sold_count"], ["sold"]],
+    "ctime": [["ctime"]],
+    "is_sold_out": [["is_sold_out"]],
+    "shop_location": [["shop_data", "shop_location"], ["shop_location"]],
+})
+UNKNOWN = Shape("unknown", _recursive_accessor)
+
+
+def detect_shape(item):
+    if "item_card_displayed_asset" in item:
+        return ITEM_CARD
+    if isinstance(item.get("item_basic"), dict):
+        return ITEM_BASIC
+    if "itemid" in item and "name" in item:
+        return FLAT
+    return UNKNOWN
+
+
+def iter_item_fields(items, stats=None):
+    """Yield a dict of raw field values (None when missing) for each item.
+
+    The shape is detected once from the first item of the list and its
+    accessor is reused for the rest of the list.
+    """
+    if stats is None:
+        stats = SHAPE_STATS
+    accessor = None
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if accessor is None:
+            shape = detect_shape(item)
+            if shape is UNKNOWN:
+                logger.debug("Unknown item shape with keys %s", sorted(item)[:20])
+            accessor = shape.accessor
+        yield accessor(item, stats)
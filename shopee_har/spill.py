@@ -0,0 +1,259 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import group_totals
+from .cache import HAS_PARQUET
+from .columns import ITEM_KEY, concat_frames, drop_duplicate_items
+from .layouts import full_layout
+from .metrics import count, timed
+
+DEFAULT_MEMORY_BUDGET = int(os.environ.get("SHOPEE_HAR_MEMORY_BUDGET", 256 * 1024 * 1024))
+DEFAULT_BUCKETS = 32
+
+# Nomor urut baris saat ditambahkan; dipakai supaya urutan dan hasil dedup sama dengan mode biasa
+_ROW = "_row"
+
+
+class PartitionStore:
+    """Result rows flushed to on-disk columnar partitions once a memory budget is used.
+
+    Rows are hash-partitioned by (shopid, itemid) into ``buckets`` files
+    per flush, so every capture of an item lands in the same bucket and
+    de-duplication can run one bucket at a time. A bucket that grows past
+    ``memory_budget`` is split into sub-buckets by further hash bits
+    before it is read, so peak memory stays around ``memory_budget`` no
+    matter how many HARs were added.
+
+    Partitions are Parquet (pickle when pyarrow is missing). Without a
+    ``directory`` a temporary one is used and removed by ``close``.
+    """
+
+    def __init__(self, directory=None, memory_budget=DEFAULT_MEMORY_BUDGET, buckets=DEFAULT_BUCKETS):
+        self.owned = directory is None
+        self.directory = tempfile.mkdtemp(prefix="shopee_har-spill-") if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        self.memory_budget = memory_budget
+        self.buckets = buckets
+        self.suffix = ".parquet" if HAS_PARQUET else ".pkl"
+        self.pending = []
+        self.pending_bytes = 0
+        self.rows = 0
+        self.spills = 0
+        # Ukuran (di memori) semua baris per bucket, dan jumlah sub-bucket bucket yang sudah dipecah
+        self.bucket_bytes = [0] * buckets
+        self.splits = {}
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, frame):
+        if frame is None or frame.empty:
+            return
+        frame = frame.assign(**{_ROW: np.arange(self.rows, self.rows + len(frame), dtype=np.int64)})
+        self.rows += len(frame)
+        self.pending.append(frame)
+        self.pending_bytes += int(frame.memory_usage(deep=True).sum())
+        if self.pending_bytes >= self.memory_budget:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one partition per bucket."""
+        if not self.pending:
+            return
+        with timed("spill"):
+            frame = concat_frames(self.pending)
+            self.pending = []
+            self.pending_bytes = 0
+            hashes = _hash(frame)
+            buckets = hashes % self.buckets
+            for bucket in np.unique(buckets):
+                part = frame[buckets == bucket]
+                self.bucket_bytes[bucket] += int(part.memory_usage(deep=True).sum())
+                self._write_bucket(part, hashes[buckets == bucket], bucket, self.spills)
+            self.spills += 1
+
+    def _write_bucket(self, part, hashes, bucket, spill):
+        ways = self.splits.get(bucket)
+        if ways is None:
+            self._write(part, self._path(bucket, spill))
+            return
+        subs = (hashes // self.buckets) % ways
+        for sub in np.unique(subs):
+            self._write(part[subs == sub], self._path(bucket, spill, (ways, sub)))
+
+    def _write(self, part, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if HAS_PARQUET:
+            part.to_parquet(path, index=False)
+        else:
+            part.to_pickle(path)
+        count("spill:partitions")
+        count("bytes:spilled", os.path.getsize(path))
+
+    def _path(self, bucket, spill, sub=None):
+        directory = os.path.join(self.directory, f"bucket-{bucket:03d}")
+        if sub is not None:
+            ways, sub = sub
+            directory = os.path.join(directory, f"split-{ways}", f"sub-{sub:04d}")
+        return os.path.join(directory, f"part-{spill:06d}{self.suffix}")
+
+    def _bucket_paths(self, bucket, spill):
+        ways = self.splits.get(bucket)
+        if ways is None:
+            return [self._path(bucket, spill)]
+        return [self._path(bucket, spill, (ways, sub)) for sub in range(ways)]
+
+    def _split(self, bucket):
+        """Rewrite a bucket larger than the memory budget as sub-buckets that each fit, one part at a time."""
+        # Jumlah sub-bucket selalu naik, jadi direktori split-<ways> yang baru tidak bertabrakan dengan yang lama
+        ways = 2 * max(1, -(-self.bucket_bytes[bucket] // self.memory_budget))
+        with timed("respill"):
+            for spill in range(self.spills):
+                for path in self._bucket_paths(bucket, spill):
+                    if not os.path.exists(path):
+                        continue
+                    part = self._read([path], None)
+                    subs = (_hash(part) // self.buckets) % ways
+                    for sub in np.unique(subs):
+                        self._write(part[subs == sub], self._path(bucket, spill, (ways, sub)))
+                    os.remove(path)
+            self.splits[bucket] = ways
+        count("spill:splits")
+
+    def _dedup_groups(self):
+        for bucket in range(self.buckets):
+            if self.bucket_bytes[bucket] > self.memory_budget * self.splits.get(bucket, 1):
+                self._split(bucket)
+            ways = self.splits.get(bucket)
+            if ways is None:
+                yield [self._path(bucket, spill) for spill in range(self.spills)]
+                continue
+            for sub in range(ways):
+                yield [self._path(bucket, spill, (ways, sub)) for spill in range(self.spills)]
+
+    def _read(self, paths, columns):
+        frames = []
+        for path in paths:
+            if HAS_PARQUET:
+                frames.append(pd.read_parquet(path, columns=columns))
+            else:
+                frame = pd.read_pickle(path)
+                frames.append(frame if columns is None else frame[columns])
+        return concat_frames(frames) if frames else None
+
+    def iter_frames(self, dedup=True, columns=None, where=None, ordered=True):
+        """Yield the stored rows one partition at a time, in the order they were added.
+
+        With ``dedup`` each bucket is de-duplicated like ``drop_duplicate_items``
+        over all rows, written back sorted by row number and the buckets are
+        merged, so the rows and their order match ``drop_duplicate_items``
+        over the concatenated frames; ``ordered=False`` skips the merge and
+        yields the buckets in hash order. ``where`` is a function returning a
+        boolean mask for a frame and is applied after de-duplication;
+        ``columns`` limits the columns read.
+        """
+        self.flush()
+        read_columns = columns
+        if columns is not None:
+            needed = ITEM_KEY + ["last_update", "sources"] if dedup else []
+            read_columns = list(dict.fromkeys(list(columns) + needed + [_ROW]))
+        if dedup:
+            groups = list(self._dedup_groups())
+        else:
+            groups = ([path for bucket in range(self.buckets) for path in self._bucket_paths(bucket, spill)] for spill in range(self.spills))
+        frames = self._iter_groups(groups, dedup, read_columns, where)
+        if dedup and ordered:
+            # Tiap run di-merge per potongan; semua potongan yang dimuat bersama muat dalam memory_budget
+            frames = self._merge_runs(frames, self.memory_budget // max(1, len(groups)))
+        for frame in frames:
+            frame = frame.drop(columns=_ROW).reset_index(drop=True)
+            if columns is not None:
+                frame = frame[list(columns)]
+            if not frame.empty:
+                yield frame
+
+    def _iter_groups(self, groups, dedup, read_columns, where):
+        for paths in groups:
+            frame = self._read([path for path in paths if os.path.exists(path)], read_columns)
+            if frame is None:
+                continue
+            with timed("partition"):
+                if dedup:
+                    frame = drop_duplicate_items(frame)
+                frame = frame.sort_values(_ROW, kind="stable")
+                if where is not None:
+                    frame = frame[np.asarray(where(frame), dtype=bool)]
+            if not frame.empty:
+                yield frame
+
+    def _merge_runs(self, frames, piece_bytes):
+        """K-way merge of frames sorted by row number, via pieces of about ``piece_bytes`` written to disk."""
+        directory = tempfile.mkdtemp(prefix="merge-", dir=self.directory)
+        try:
+            runs = []
+            for frame in frames:
+                row_bytes = max(1, int(frame.memory_usage(deep=True).sum()) // len(frame))
+                piece_rows = max(1024, piece_bytes // row_bytes)
+                pieces = []
+                for start in range(0, len(frame), piece_rows):
+                    pieces.append(os.path.join(directory, f"run-{len(runs):05d}-{len(pieces):05d}{self.suffix}"))
+                    self._write(frame.iloc[start:start + piece_rows], pieces[-1])
+                runs.append(iter(pieces))
+            heads = {run: self._read([next(pieces)], None) for run, pieces in enumerate(runs)}
+            while heads:
+                with timed("merge"):
+                    # Semua baris sampai nomor terkecil di antara akhir potongan yang dimuat sudah lengkap
+                    bound = min(frame[_ROW].iat[-1] for frame in heads.values())
+                    ready = []
+                    for run, frame in list(heads.items()):
+                        cut = int(np.searchsorted(frame[_ROW].to_numpy(), bound, side="right"))
+                        ready.append(frame.iloc[:cut])
+                        if cut < len(frame):
+                            heads[run] = frame.iloc[cut:]
+                            continue
+                        path = next(runs[run], None)
+                        if path is None:
+                            del heads[run]
+                        else:
+                            heads[run] = self._read([path], None)
+                    frame = concat_frames([part for part in ready if not part.empty]).sort_values(_ROW, kind="stable")
+                yield frame
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def group_totals(self, dimension, dedup=True, where=None):
+        """``aggregates.group_totals`` over every partition, reading only the columns it needs."""
+        columns = [dimension, "price", "sold_30_days"]
+        totals = [group_totals(frame, dimension) for frame in self.iter_frames(dedup, columns, where, ordered=False)]
+        if not totals:
+            return group_totals(pd.DataFrame(columns=columns), dimension)
+        # Dengan dedup tiap item hanya ada di satu bucket, jadi total per bucket cukup dijumlahkan
+        return pd.concat(totals).groupby(level=0, sort=False).sum()
+
+    def export(self, writer, layout=full_layout, dedup=True, where=None):
+        """Write every partition through a streaming writer from ``export.open_writer``; returns the row count."""
+        rows = 0
+        for frame in self.iter_frames(dedup, where=where):
+            with timed("write"):
+                writer.write(layout(frame))
+            rows += len(frame)
+        return rows
+
+    def close(self):
+        self.pending = []
+        if self.owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _hash(frame):
+    return pd.util.hash_pandas_object(frame[ITEM_KEY], index=False).to_numpy()
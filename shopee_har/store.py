@@ -0,0 +1,180 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from .extract import extract_frame
+from .metrics import count
+
+DEFAULT_STORE_BYTES = int(os.environ.get("SHOPEE_HAR_STORE_BYTES", 1024 * 1024 * 1024))
+
+
+def sizeof(value):
+    """Approximate memory held by a stored value, in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def dataset_key(results, namespace=""):
+    """Content key of a dataset built from FileResults, in order; None when a result has no key."""
+    keys = [result.key for result in results]
+    if not keys or None in keys:
+        return None
+    digest = hashlib.sha256(f"{namespace}:".encode("utf-8"))
+    digest.update("\0".join(keys).encode("ascii"))
+    return digest.hexdigest()
+
+
+class _Entry:
+    __slots__ = ("value", "size", "cost", "hits", "priority")
+
+    def __init__(self, value, size, cost):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.hits = 1
+        self.priority = 0.0
+
+
+class DatasetStore:
+    """Process-wide, memory-budgeted store of built datasets shared by every session.
+
+    Each value is kept once per key; callers must treat it as read-only and
+    work on row positions (``SearchIndex.filter_rows``, ``sort_rows``)
+    instead of filtered copies. Concurrent requests for a missing key build
+    it once.
+
+    Eviction is size-aware (GreedyDual-Size-Frequency): an entry's priority
+    is the store's clock plus hits * build seconds / bytes, so large entries
+    that are cheap to rebuild and rarely used go first. Values larger than
+    the whole budget are returned but not kept.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_STORE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.clock = 0.0
+        self.entries = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            entry.hits += 1
+            entry.priority = self._priority(entry)
+            self.stats["hits"] += 1
+        count("store:hit")
+        return entry.value
+
+    def get_or_build(self, key, build):
+        """Return the value stored under ``key``, calling ``build()`` once if it is missing."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            value = self.get(key)
+            if value is not None:
+                return value
+            started = time.perf_counter()
+            try:
+                value = build()
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+            self.put(key, value, time.perf_counter() - started)
+        return value
+
+    def put(self, key, value, cost=0.0):
+        size = max(sizeof(value), 1)
+        with self._lock:
+            self.stats["misses"] += 1
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            entry = _Entry(value, size, cost)
+            entry.priority = self._priority(entry)
+            self.entries[key] = entry
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                victim = min(self.entries, key=lambda name: self.entries[name].priority)
+                self.clock = self.entries[victim].priority
+                self._remove(victim)
+                self.stats["evictions"] += 1
+        count("store:miss")
+
+    def _priority(self, entry):
+        # Biaya dihitung per MB supaya angkanya tidak terlalu kecil
+        return self.clock + entry.hits * max(entry.cost, 1e-6) / (entry.size / (1 << 20))
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def summary(self):
+        with self._lock:
+            return {"entries": len(self.entries), "bytes": self.bytes, "max_bytes": self.max_bytes, **self.stats}
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_store():
+    """The DatasetStore of this process, budgeted by SHOPEE_HAR_STORE_BYTES."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DatasetStore()
+        return _shared
+
+
+def result_frames(results, cache=None, files=None):
+    """The non-empty frames of FileResults, in order.
+
+    Frames dropped by ``ExtractionJob.release_frames`` are read back from
+    ``cache`` (a ResultCache) by their key. When the cache has evicted one,
+    the file is extracted again from ``files`` (the inputs of ``results``,
+    in the same order); without it a LookupError is raised, so a dataset is
+    never built from only part of its files.
+    """
+    frames = []
+    for position, result in enumerate(results):
+        frame = result.frame
+        if frame is None and result.error is None and result.key is not None:
+            frame = cache.get(result.key) if cache is not None else None
+            if frame is None:
+                if files is None:
+                    raise LookupError(f"{result.name}: frame was released and is no longer in the result cache")
+                file = files[position]
+                if hasattr(file, "seek"):
+                    file.seek(0)
+                frame = extract_frame(file)
+                count("store:reextract")
+                if cache is not None:
+                    cache.put(result.key, frame)
+        if frame is not None and not frame.empty:
+            frames.append(frame)
+    return frames
@@ -0,0 +1,227 @@
+import argparse
+import base64
+import datetime
+import json
+import random
+import re
+import sys
+from collections import Counter
+
+# Naikkan jika isi file hasil generator berubah, supaya file lama tidak dipakai ulang
+GENERATOR_VERSION = "1"
+
+SHAPES = ("item_cards", "item_basic", "data_items", "sections")
+
+_WORDS = (
+    "Kaos", "Polos", "Pria", "Wanita", "Cotton", "Combed", "30s", "Kemeja", "Flanel", "Celana", "Jeans",
+    "Sepatu", "Sneakers", "Tas", "Selempang", "Hijab", "Instan", "Gamis", "Jaket", "Hoodie", "Anak",
+    "Murah", "Original", "Premium", "Import", "Grosir", "COD", "Terlaris", "Promo", "XL", "XXL",
+    "Hitam", "Putih", "Navy", "Maroon", "Oversize", "Slimfit", "Korean", "Style", "100%", "Bisa",
+)
+_DECORATIONS = ("", "", "", " ✨", " 🔥", " [READY]", " (Bisa COD)", " - Free Ongkir", "  ", " & Gift")
+_LOCATIONS = (
+    "Kota Jakarta Barat", "Kota Jakarta Utara", "Kab. Bandung", "Kota Surabaya", "Kota Medan",
+    "Kab. Tangerang", "Kota Semarang", "Kota Yogyakarta", "Kab. Bogor", "Luar Negeri",
+)
+_NOISE_APIS = (
+    "/api/v4/account/basic/get_account_info", "/api/v4/pages/get_homepage_category_list",
+    "/api/v4/notification/get_activities", "/api/v4/cart/mini", "/api/v4/search/search_hint",
+)
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+def parse_size(text):
+    """Parse sizes such as ``512KB``, ``64MB`` or ``2GB`` into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", text.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+class _Catalog:
+    """Pool of shops and items that product entries draw from.
+
+    Items are drawn with replacement, so the same product shows up on
+    several pages like it does in a real browsing session.
+    """
+
+    def __init__(self, rng, items):
+        self.rng = rng
+        self.items = max(items, 50)
+        self.shops = max(self.items // 40, 5)
+
+    def item(self, index):
+        rng = random.Random(index)
+        shopid = 10_000_000 + index % self.shops
+        words = rng.sample(_WORDS, rng.randint(3, 9))
+        return {
+            "itemid": 20_000_000_000 + index,
+            "shopid": shopid,
+            "name": " ".join(words) + rng.choice(_DECORATIONS),
+            "price": rng.randrange(5_000, 2_500_000, 500) * 100_000,
+            "shop_name": f"{rng.choice(_WORDS)} Store {shopid % 9973}",
+            "shop_location": _LOCATIONS[shopid % len(_LOCATIONS)],
+            "shop_rating": round(4 + (shopid % 100) / 100, 2),
+            "rating_star": round(rng.uniform(3.5, 5), 6),
+            "rating_count": [rng.randrange(0, 5000)] + [rng.randrange(0, 200) for _ in range(5)],
+            "historical_sold": rng.randrange(0, 50_000),
+            "sold": rng.randrange(0, 2_000),
+            "ctime": 1_600_000_000 + rng.randrange(0, 150_000_000),
+            "is_sold_out": rng.random() < 0.03,
+            "images": [f"id-11134207-{rng.getrandbits(40):x}" for _ in range(rng.randint(3, 9))],
+        }
+
+    def sample(self, count):
+        return [self.item(self.rng.randrange(self.items)) for _ in range(count)]
+
+
+def _flat(item):
+    return {
+        "itemid": item["itemid"], "shopid": item["shopid"], "name": item["name"], "price": item["price"],
+        "price_min": item["price"], "price_max": item["price"], "shop_name": item["shop_name"],
+        "shop_location": item["shop_location"], "shop_rating": item["shop_rating"],
+        "item_rating": {"rating_star": item["rating_star"], "rating_count": item["rating_count"]},
+        "historical_sold": item["historical_sold"], "sold": item["sold"], "ctime": item["ctime"],
+        "is_sold_out": item["is_sold_out"], "images": item["images"], "image": item["images"][0],
+        "currency": "IDR", "stock": 0, "status": 1, "brand": None, "tier_variations": [],
+    }
+
+
+def _item_card(item):
+    return {
+        "itemid": item["itemid"], "shopid": item["shopid"], "ctime": item["ctime"], "is_sold_out": item["is_sold_out"],
+        "item_card_displayed_asset": {"name": item["name"], "image": item["images"][0], "images": item["images"]},
+        "item_card_display_price": {"price": item["price"], "strikethrough_price": None, "discount": 0},
+        "item_card_display_rating": {"rating_star": item["rating_star"], "rating_count": item["rating_count"][0]},
+        "item_card_display_sold_count": {
+            "historical_sold_count": item["historical_sold"], "monthly_sold_count": item["sold"],
+        },
+        "shop_data": {"shop_name": item["shop_name"], "shop_location": item["shop_location"]},
+        "display_ad_tag": 0, "label_ids": [1001, 1002, 822],
+    }
+
+
+def _product_payload(shape, items):
+    if shape == "item_cards":
+        return "/api/v4/search/search_items", {"item_cards": [_item_card(item) for item in items], "nomore": False}
+    if shape == "item_basic":
+        return "/api/v4/search/search_items", {
+            "items": [{"item_basic": _flat(item), "adsid": None, "itemid": item["itemid"], "shopid": item["shopid"]} for item in items],
+            "total_count": 3000,
+        }
+    if shape == "data_items":
+        return "/api/v4/shop/rcmd_items", {"data": {"items": [_flat(item) for item in items], "total": 500}, "error": 0}
+    half = len(items) // 2
+    sections = [{"key": "similar", "data": {"item": [_flat(item) for item in part]}} for part in (items[:half], items[half:])]
+    return "/api/v4/recommend/recommend_post", {"data": {"sections": sections}, "error": 0}
+
+
+def _entry(started, url, mime_type, text, encoding=None, method="GET"):
+    content = {"size": len(text), "mimeType": mime_type, "text": text}
+    if encoding:
+        content["encoding"] = encoding
+    return {
+        "startedDateTime": started.isoformat(timespec="milliseconds") + "Z",
+        "time": 120.5,
+        "request": {
+            "method": method, "url": url, "httpVersion": "http/2.0",
+            "headers": [{"name": "accept", "value": "application/json"}, {"name": "x-api-source", "value": "pc"}],
+            "queryString": [], "cookies": [], "headersSize": -1, "bodySize": 0,
+        },
+        "response": {
+            "status": 200, "statusText": "", "httpVersion": "http/2.0",
+            "headers": [{"name": "content-type", "value": mime_type}], "cookies": [],
+            "content": content, "redirectURL": "", "headersSize": -1, "bodySize": len(text),
+        },
+        "cache": {},
+        "timings": {"blocked": 0.5, "dns": -1, "ssl": -1, "connect": -1, "send": 0.1, "wait": 110.2, "receive": 9.7},
+    }
+
+
+def _noise_entry(rng, started):
+    kind = rng.random()
+    if kind < 0.45:
+        blob = base64.b64encode(rng.randbytes(rng.randint(2_000, 40_000))).decode("ascii")
+        return _entry(started, f"https://down-id.img.susercontent.com/file/{rng.getrandbits(64):x}_tn", "image/webp", blob, "base64")
+    if kind < 0.65:
+        script = "!function(){" + ";".join(f"var a{i}={rng.getrandbits(30)}" for i in range(rng.randint(200, 3000))) + "}();"
+        return _entry(started, f"https://deo.shopeemobile.com/shopee/bundle.{rng.getrandbits(32):x}.js", "application/javascript", script)
+    if kind < 0.9:
+        body = json.dumps({"error": 0, "data": {"list": [{"id": rng.getrandbits(32), "name": rng.choice(_WORDS)} for _ in range(rng.randint(5, 80))]}})
+        return _entry(started, "https://shopee.co.id" + rng.choice(_NOISE_APIS), "application/json", body)
+    return _entry(started, "https://shopee.co.id/__t__", "text/plain", "", method="POST")
+
+
+def write_har(file, target_bytes, seed=0, noise_ratio=0.6, base64_ratio=0.5, shapes=SHAPES):
+    """Write a synthetic HAR of about ``target_bytes`` to a path or binary file.
+
+    Product entries use every shape in ``shapes`` (search ``item_cards``,
+    search ``items[].item_basic``, shop ``data.items`` and recommendation
+    ``data.sections``); the rest are images, scripts, unrelated JSON APIs
+    and tracking beacons.
+
+    Returns a dict with the number of entries, product entries, items per
+    shape and bytes written.
+    """
+    if isinstance(file, str):
+        with open(file, "wb") as fileobj:
+            return write_har(fileobj, target_bytes, seed, noise_ratio, base64_ratio, shapes)
+    rng = random.Random(seed)
+    # Kira-kira satu produk unik per 2 KB, jadi sebagian produk muncul lebih dari sekali
+    catalog = _Catalog(rng, target_bytes // 2048)
+    started = datetime.datetime(2025, 4, 19, 8, 0, 0)
+    stats = Counter()
+    written = file.write(b'{"log":{"version":"1.2","creator":{"name":"shopee_har.synthetic","version":"' + GENERATOR_VERSION.encode() + b'"},"pages":[],"entries":[')
+    while written < target_bytes:
+        started += datetime.timedelta(milliseconds=rng.randint(5, 900))
+        if rng.random() < noise_ratio:
+            entry = _noise_entry(rng, started)
+        else:
+            shape = rng.choice(shapes)
+            items = catalog.sample(rng.randint(20, 60))
+            path, payload = _product_payload(shape, items)
+            body = json.dumps(payload, ensure_ascii=rng.random() < 0.5)
+            url = f"https://shopee.co.id{path}?by=relevancy&limit=60&newest={rng.randrange(0, 3000, 60)}"
+            if rng.random() < base64_ratio:
+                entry = _entry(started, url, "application/json", base64.b64encode(body.encode("utf-8")).decode("ascii"), "base64")
+                stats["base64_entries"] += 1
+            else:
+                entry = _entry(started, url, "application/json", body)
+            stats["product_entries"] += 1
+            stats[f"items:{shape}"] += len(items)
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        written += file.write(data if not stats["entries"] else b"," + data)
+        stats["entries"] += 1
+    written += file.write(b"]}}")
+    stats["bytes"] = written
+    return dict(stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m shopee_har.synthetic",
+        description="Write a deterministic synthetic Shopee HAR covering every known response shape, "
+        "mixed with noise entries. The same seed and size always give the same bytes.",
+    )
+    parser.add_argument("output", help="output .har path ('-' for stdout)")
+    parser.add_argument("--size", default="16MB", help="approximate file size, e.g. 1MB, 256MB, 4GB (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--noise", type=float, default=0.6, help="share of non-product entries (default: %(default)s)")
+    parser.add_argument("--base64", type=float, default=0.5, help="share of base64 product bodies (default: %(default)s)")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma-separated response shapes (default: all)")
+    args = parser.parse_args(argv)
+    shapes = tuple(args.shapes.split(","))
+    unknown = set(shapes) - set(SHAPES)
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(sorted(unknown))}")
+    target = parse_size(args.size)
+    if args.output == "-":
+        stats = write_har(sys.stdout.buffer, target, args.seed, args.noise, args.base64, shapes)
+    else:
+        stats = write_har(args.output, target, args.seed, args.noise, args.base64, shapes)
+    print(json.dumps(stats, sort_keys=True), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
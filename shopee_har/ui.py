@@ -0,0 +1,109 @@
+import contextlib
+
+import pandas as pd
+import streamlit as st
+
+from .archive import expand_archives
+from .background import ExtractionJob
+from .cache import ResultCache
+from .export import EXPORT_FORMATS, export_bytes
+from .paging import sort_rows
+from .search import SearchIndex
+from .store import shared_store
+
+# Bagian Streamlit yang dipakai bersama oleh aplikasi extract-data-shopee, fix-extract-data-shopee
+# dan code_19_April_2025_fix; hanya di-import oleh aplikasi, bukan oleh shopee_har/__init__
+
+
+# Cache hasil ekstraksi di disk, berdasarkan hash isi file HAR
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+
+# Membuat file unduhan; _frame tidak di-hash, kunci cache-nya export_key.
+# cache_resource supaya semua sesi memakai bytes yang sama, bukan salinan
+@st.cache_resource(max_entries=6, show_spinner="Menyiapkan file...")
+def build_export(_frame, export_key, fmt, _rows=None, columns=None):
+    return export_bytes(_frame, fmt, rows=_rows, columns=list(columns) if columns else None)
+
+
+# Index pencarian dibangun sekali per dataset, kuncinya data_key
+@st.cache_resource(max_entries=4, show_spinner="Membangun index pencarian...")
+def get_search_index(_frame, data_key):
+    return SearchIndex(_frame, ["item_name", "shop_name"])
+
+
+# Urutan baris di-cache per (data, filter, kolom urut) sebagai array index
+@st.cache_resource(max_entries=16, show_spinner="Mengurutkan data...")
+def get_sort_order(_frame, data_key, filter_key, sort_column, ascending, _rows):
+    return sort_rows(_frame, sort_column, ascending, _rows)
+
+
+# Ekstraksi berjalan di thread latar belakang; job lama dibatalkan saat file yang diupload berubah
+def get_extraction_job(uploaded_files):
+    upload_key = tuple((file.file_id, file.name, file.size) for file in uploaded_files)
+    previous = st.session_state.get("extraction_job")
+    if previous is not None and previous[0] == upload_key:
+        return previous[1]
+    if previous is not None:
+        previous[1].cancel()
+    # Jumlah worker diatur lewat SHOPEE_HAR_WORKERS
+    job = ExtractionJob(expand_archives(uploaded_files), cache=get_result_cache())
+    st.session_state["extraction_job"] = (upload_key, job)
+    return job
+
+
+def cancel_extraction_job():
+    # Semua file dihapus: hentikan ekstraksi yang masih berjalan
+    if "extraction_job" in st.session_state:
+        st.session_state.pop("extraction_job")[1].cancel()
+
+
+def show_job_status(job):
+    """Show the progress bar and errors of an ExtractionJob; returns (results, metrics, progress)."""
+    results, metrics = job.snapshot()
+    progress = job.progress()
+    if not job.done:
+        st.progress(
+            progress["files_done"] / max(progress["files_total"], 1),
+            text=f"{progress['files_done']}/{progress['files_total']} file, {progress['entries']} entri, {progress['items']} item ditemukan",
+        )
+    if job.error:
+        st.error(f"Ekstraksi berhenti: {job.error}")
+    for result in results:
+        if result.error:
+            st.error(f"Gagal memproses file {result.name}: {result.error}")
+    return results, metrics, progress
+
+
+def rerun_until_done(job, seen):
+    # Halaman diperbarui setiap ada file baru yang selesai diproses
+    if not job.done:
+        job.wait(seen, timeout=2)
+        st.rerun()
+
+
+def export_buttons(frame, export_key, rows=None, columns=None, file_name="shopee_data", metrics=None):
+    """One "prepare" button per export format; the file is built on demand and cached by ``export_key``."""
+    for column, (fmt, (label, mime)) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+        with column:
+            if st.button(f"Siapkan {label}", key=f"prepare_{fmt}"):
+                st.session_state[f"export_{fmt}"] = export_key
+            if st.session_state.get(f"export_{fmt}") == export_key:
+                with metrics.stage(f"export_{fmt}") if metrics is not None else contextlib.nullcontext():
+                    data = build_export(frame, export_key, fmt, rows, tuple(columns) if columns else None)
+                st.download_button(f"Download {label}", data, f"{file_name}.{fmt}", mime)
+
+
+def show_debug_panel(metrics, results):
+    # Panel debug: buka aplikasi dengan ?debug=1
+    if not st.query_params.get("debug"):
+        return
+    with st.expander("Debug: waktu per tahap dan penghitung", expanded=True):
+        st.json(metrics.to_dict())
+        st.json(shared_store().summary())
+        st.dataframe(pd.DataFrame([
+            {"file": result.name, "error": result.error, **(result.metrics.to_dict()["timings"] if result.metrics else {})}
+            for result in results
+        ]), use_container_width=True)
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from .archive import expand_archives
+from .cache import hash_content
+from .cli import expand_inputs
+from .history import DEFAULT_HISTORY_PATH, SnapshotStore
+from .metrics import Metrics, collect_metrics, configure_metrics_log, log_metrics
+from .parallel import default_workers, iter_extract_files
+
+# Jendela (detik) untuk throughput terkini
+RECENT_SECONDS = 60
+
+
+class Watcher:
+    """Ingests new or changed HARs from a directory into a SnapshotStore.
+
+    Files are polled by (size, mtime) and picked up once they have not
+    been modified for ``settle`` seconds, so captures still being written
+    by DevTools are left alone. Every HAR is recorded in the store by
+    content hash (``hash_content``, not salted with the extractor version),
+    so a file is ingested exactly once even if it is copied, renamed or
+    touched, or the extractor is upgraded; files that fail are retried only
+    after they change.
+    """
+
+    def __init__(self, directory, store, max_workers=None, settle=2.0):
+        self.directory = directory
+        self.store = store
+        self.max_workers = max_workers
+        self.settle = settle
+        self.known = {}
+        self.backlog = {}
+        self.totals = Counter()
+        self.recent = deque()
+        self.last_lag = None
+        self.started = time.time()
+
+    def scan(self):
+        """Update the backlog from the directory and return the paths ready to ingest."""
+        now = time.time()
+        present = set()
+        for path in expand_inputs([self.directory]):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            present.add(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self.known.get(path) != signature:
+                self.backlog[path] = signature
+        for path in list(self.backlog):
+            if path not in present:
+                del self.backlog[path]
+        return sorted(path for path, (_, mtime_ns) in self.backlog.items() if now - mtime_ns / 1e9 >= self.settle)
+
+    def ingest(self, paths, log=None):
+        """Extract the HARs in ``paths`` that are not in the store yet and add them; returns the batch Metrics."""
+        metrics = Metrics()
+        todo = []
+        keys = set()
+        with collect_metrics(metrics):
+            for path in paths:
+                size, mtime_ns = self.known[path] = self.backlog.pop(path)
+                # Hash dulu supaya isi yang sudah pernah masuk tidak diekstrak lagi
+                for member in expand_archives([path]):
+                    with metrics.stage("hash"):
+                        key = hash_content(member)
+                    if key in keys or self.store.has_file(key):
+                        self.totals["files_skipped"] += 1
+                        continue
+                    keys.add(key)
+                    todo.append((member, key, size, mtime_ns))
+            results = iter_extract_files([member for member, _, _, _ in todo], max_workers=self.max_workers)
+            for (member, key, size, mtime_ns), result in zip(todo, results):
+                if result.error:
+                    self.totals["files_failed"] += 1
+                    if log:
+                        log(f"{result.name}: {result.error}")
+                    continue
+                with metrics.stage("store"):
+                    self.store.add_frame(result.frame, key, result.name)
+                rows = len(result.frame) if result.frame is not None else 0
+                now = time.time()
+                self.last_lag = now - mtime_ns / 1e9
+                self.totals.update(files_ingested=1, rows=rows, bytes=size)
+                self.recent.append((now, size, rows))
+                if log:
+                    log(f"{result.name}: {rows} rows, {self.last_lag:.1f}s after capture")
+        return metrics
+
+    def stats(self):
+        """Totals, backlog and throughput since start and over the last RECENT_SECONDS."""
+        now = time.time()
+        while self.recent and self.recent[0][0] < now - RECENT_SECONDS:
+            self.recent.popleft()
+        uptime = max(now - self.started, 1e-9)
+        window = min(uptime, RECENT_SECONDS)
+        recent_bytes = sum(size for _, size, _ in self.recent)
+        recent_rows = sum(rows for _, _, rows in self.recent)
+        return {
+            "files_ingested": self.totals["files_ingested"],
+            "files_skipped": self.totals["files_skipped"],
+            "files_failed": self.totals["files_failed"],
+            "rows": self.totals["rows"],
+            "bytes": self.totals["bytes"],
+            "backlog_files": len(self.backlog),
+            "backlog_bytes": sum(size for size, _ in self.backlog.values()),
+            "mb_per_s": round(self.totals["bytes"] / (1 << 20) / uptime, 3),
+            "rows_per_s": round(self.totals["rows"] / uptime, 1),
+            "recent_mb_per_s": round(recent_bytes / (1 << 20) / window, 3),
+            "recent_rows_per_s": round(recent_rows / window, 1),
+            "last_lag_s": round(self.last_lag, 2) if self.last_lag is not None else None,
+            "uptime_s": round(uptime, 1),
+        }
+
+    def run(self, interval=1.0, once=False, stop=None, stats_path=None, log=None):
+        """Poll and ingest until ``stop`` (a threading.Event) is set; with ``once``, until the backlog is empty."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            ready = self.scan()
+            if ready:
+                metrics = self.ingest(ready, log)
+                log_metrics("watch", metrics, **self.stats())
+            if stats_path:
+                _write_json(stats_path, self.stats())
+            if once and not self.backlog:
+                break
+            stop.wait(interval)
+        return self.stats()
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fileobj:
+        json.dump(data, fileobj, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m shopee_har.watch",
+        description="Watch a directory and ingest every new or changed HAR into the SQLite history store exactly once.",
+    )
+    parser.add_argument("directory", help="directory to watch (searched recursively for .har and archives)")
+    parser.add_argument("--history", metavar="DB", default=DEFAULT_HISTORY_PATH, help="SQLite history store (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=default_workers(), help="worker processes (default: %(default)s)")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between directory scans (default: %(default)s)")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds a file must be unmodified before it is read (default: %(default)s)")
+    parser.add_argument("--stats", metavar="PATH", help="keep throughput/backlog stats in this JSON file")
+    parser.add_argument("--metrics-log", metavar="PATH", help="write per-batch timings and stats as JSON lines ('-' for stderr)")
+    parser.add_argument("--once", action="store_true", help="ingest what is there now and exit")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"not a directory: {args.directory}")
+    if args.metrics_log:
+        configure_metrics_log(args.metrics_log)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    store = SnapshotStore(args.history)
+    watcher = Watcher(args.directory, store, args.workers, args.settle)
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    try:
+        stats = watcher.run(args.interval, args.once, stop, args.stats, log)
+    except KeyboardInterrupt:
+        stats = watcher.stats()
+    finally:
+        store.close()
+    print(json.dumps(stats), file=sys.stderr)
+    return 1 if stats["files_failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Paket shopee_har dipakai langsung dari repo (tidak di-install)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
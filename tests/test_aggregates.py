@@ -0,0 +1,52 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from shopee_har.aggregates import DIMENSIONS, Aggregates, group_totals, top_n
+from shopee_har.columns import concat_frames, drop_duplicate_items
+from shopee_har.extract import extract_frame
+from shopee_har.synthetic import write_har
+
+
+def _frames():
+    frames = []
+    for seed in (0, 1, 0):
+        file = io.BytesIO()
+        write_har(file, 400 * 1024, seed=seed)
+        frames.append(extract_frame(file.getvalue()))
+    # Item yang sama ditangkap lagi belakangan di toko lain, plus baris tanpa id
+    moved = frames[0].iloc[:5].copy()
+    moved["shop_name"] = "Toko Pindahan"
+    moved["last_update"] = moved["last_update"] + pd.Timedelta(days=1)
+    orphans = frames[1].iloc[:3].copy()
+    orphans[["shopid", "itemid"]] = pd.NA
+    return frames + [moved, orphans]
+
+
+def _sorted(totals):
+    return totals.sort_index().astype(np.float64)
+
+
+def test_incremental_totals_match_group_totals_over_deduped_concat():
+    frames = _frames()
+    aggregates = Aggregates()
+    for number, frame in enumerate(frames):
+        assert aggregates.add(frame, key=number)
+        expected = drop_duplicate_items(concat_frames(frames[:number + 1]))
+        for dimension in DIMENSIONS:
+            pd.testing.assert_frame_equal(
+                _sorted(aggregates.totals[dimension]), _sorted(group_totals(expected, dimension)), check_names=False, check_index_type=False
+            )
+    assert not aggregates.add(frames[0], key=0)
+    assert "Toko Pindahan" in aggregates.totals["shop_name"].index
+
+
+def test_top_n_keeps_largest_groups_and_sums_the_rest():
+    totals = group_totals(drop_duplicate_items(concat_frames(_frames())), "shop_name")
+    result = top_n(totals, 5)
+    expected = totals.sort_values("total_revenue", ascending=False, kind="stable")
+    assert list(result["shop_name"][:5]) == list(expected.index[:5])
+    assert result["shop_name"].iloc[-1] == f"Lainnya ({len(totals) - 5})"
+    np.testing.assert_allclose(result["total_revenue"].sum(), totals["total_revenue"].sum())
+    assert len(top_n(totals, len(totals))) == len(totals)
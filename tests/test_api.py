@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from shopee_har.api import Dataset, make_handler, write_sample_dir
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("sample")
+    write_sample_dir(str(directory), files=2, size=200 * 1024)
+    return Dataset([str(directory)], max_workers=1)
+
+
+@pytest.fixture(scope="module")
+def server(dataset):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(dataset))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _itemids(result):
+    return sorted(item["itemid"] for item in result["items"])
+
+
+def _query(index, **params):
+    return index.query({"page_size": "1000", **params})
+
+
+def test_filters_match_pandas(dataset):
+    index = dataset.index
+    frame = index.frame
+    assert len(index) == len(frame) > 0
+
+    shopid = int(frame["shopid"].iloc[0])
+    assert _itemids(_query(index, shopid=str(shopid))) == sorted(frame.loc[frame["shopid"] == shopid, "itemid"])
+
+    shop_name = frame["shop_name"].iloc[0]
+    expected = sorted(frame.loc[frame["shop_name"] == shop_name, "itemid"])
+    assert _itemids(_query(index, shop_name=f"  {shop_name.upper()} ")) == expected
+
+    low, high = frame["price"].quantile([0.25, 0.75])
+    expected = sorted(frame.loc[frame["price"].between(low, high), "itemid"])
+    assert _itemids(_query(index, min_price=str(low), max_price=str(high))) == expected
+
+    day = frame["upload_date"].iloc[0].normalize()
+    expected = sorted(frame.loc[frame["upload_date"].dt.normalize() == day, "itemid"])
+    assert _itemids(_query(index, upload_date=day.strftime("%Y-%m-%d"))) == expected
+
+    word = frame["item_name"].iloc[0].split()[0]
+    expected = sorted(frame.loc[frame["item_name"].str.casefold().str.contains(word.casefold(), regex=False), "itemid"])
+    assert _itemids(_query(index, q=word.lower())) == expected
+
+    combined = _query(index, shopid=str(shopid), q=word)
+    assert {item["shopid"] for item in combined["items"]} <= {shopid}
+
+
+def test_sort_and_paging(dataset):
+    index = dataset.index
+    prices = sorted(index.frame["price"], reverse=True)
+    first = index.query({"sort": "-price", "page_size": "7"})
+    second = index.query({"sort": "-price", "page_size": "7", "page": "2"})
+    assert first["total"] == len(index)
+    assert first["pages"] == -(-len(index) // 7)
+    assert [item["price"] for item in first["items"] + second["items"]] == prices[:14]
+
+    last = index.query({"page_size": "7", "page": str(first["pages"])})
+    assert len(last["items"]) == len(index) - 7 * (first["pages"] - 1)
+    assert index.query({"page_size": "7", "page": str(first["pages"] + 1)})["items"] == []
+
+
+def test_item_lookup(dataset):
+    index = dataset.index
+    row = index.frame.iloc[0]
+    item = index.item(int(row["shopid"]), int(row["itemid"]))
+    assert (item["shopid"], item["itemid"]) == (row["shopid"], row["itemid"])
+    assert index.item(int(row["shopid"]), 1) is None
+
+
+def _get(url, method="GET"):
+    request = urllib.request.Request(url, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), json.loads(e.read())
+
+
+def test_handler(server, dataset):
+    frame = dataset.index.frame
+    row = frame.iloc[0]
+
+    status, _, body = _get(f"{server}/items?sort=-price&page_size=5")
+    assert status == 200 and len(body["items"]) == 5 and body["total"] == len(frame)
+    status, _, body = _get(f"{server}/items/{row['shopid']}/{row['itemid']}")
+    assert status == 200 and body["itemid"] == row["itemid"]
+    status, _, body = _get(f"{server}/stats")
+    assert status == 200 and body["rows"] == len(frame)
+
+    assert _get(f"{server}/items?shopid=abc")[0] == 400
+    assert _get(f"{server}/items?page_size=1001")[0] == 400
+    assert _get(f"{server}/items?upload_date=kemarin")[0] == 400
+    assert _get(f"{server}/items?sort=nope")[0] == 400
+    assert _get(f"{server}/items/{row['shopid']}/x")[0] == 400
+
+    assert _get(f"{server}/items/{row['shopid']}/1")[0] == 404
+    assert _get(f"{server}/unknown")[0] == 404
+
+    status, headers, body = _get(f"{server}/items", method="POST")
+    assert status == 405 and headers["Allow"] == "GET"
+    assert _get(f"{server}/items", method="DELETE")[0] == 405
+
+
+def test_write_sample_dir_keeps_existing_files(tmp_path):
+    paths = write_sample_dir(str(tmp_path), files=1, size=64 * 1024)
+    before = os.stat(paths[0]).st_mtime_ns
+    assert write_sample_dir(str(tmp_path), files=1, size=64 * 1024) == paths
+    assert os.stat(paths[0]).st_mtime_ns == before
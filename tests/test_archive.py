@@ -0,0 +1,15 @@
+import io
+
+from shopee_har.archive import expand_archives
+from shopee_har.parallel import extract_files
+
+
+def test_corrupt_zip_fails_as_one_file():
+    bad = io.BytesIO(b"not a zip")
+    bad.name = "capture.zip"
+    good = io.BytesIO(b'{"log": {"entries": []}}')
+    good.name = "empty.har"
+    results = extract_files(list(expand_archives([bad, good])), max_workers=1)
+    assert [result.name for result in results] == ["capture.zip", "empty.har"]
+    assert "BadZipFile" in results[0].error
+    assert results[1].error is None
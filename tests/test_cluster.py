@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from shopee_har.cluster import cluster_labels
+from shopee_har.synthetic import _Catalog
+
+
+def _noisy_copies(products=2000, copies=20000, seed=1):
+    rng = random.Random(seed)
+    words = [f"kata{number}" for number in range(3000)]
+    catalog = [(rng.sample(words, rng.randint(4, 9)), rng.uniform(5_000, 2_000_000)) for _ in range(products)]
+    names, prices, truth = [], [], []
+    for _ in range(copies):
+        product = rng.randrange(products)
+        tokens, price = list(catalog[product][0]), catalog[product][1]
+        if len(tokens) > 4 and rng.random() < 0.5:
+            tokens.pop(rng.randrange(len(tokens)))
+        if rng.random() < 0.5:
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(["Murah", "COD", "Promo", "Original", "[READY]"]))
+        names.append(" ".join(tokens))
+        prices.append(price * rng.uniform(0.92, 1.08))
+        truth.append(product)
+    return names, prices, np.array(truth)
+
+
+def test_clusters_are_pure_and_bounded():
+    names, prices, truth = _noisy_copies()
+    labels = cluster_labels(names, prices)
+    frame = pd.DataFrame({"cluster": labels, "product": truth})
+    majority = frame.groupby("cluster")["product"].agg(lambda products: products.value_counts().iloc[0])
+    assert majority.sum() / len(frame) > 0.99
+    # Tiap produk punya sekitar 10 salinan; tanpa rantai tidak ada kelompok raksasa
+    assert np.bincount(labels).max() <= 3 * frame["product"].value_counts().max()
+    assert frame.groupby("product")["cluster"].nunique().mean() < 1.5
+
+
+def test_no_chaining_through_similar_names_or_prices():
+    # a~b dan b~c (Jaccard 0.67), tetapi a~c hanya 0.43
+    names = [" ".join(f"kata{number}" for number in range(start, start + 10)) for start in (0, 2, 4)]
+    labels = cluster_labels(names, [100, 100, 100])
+    assert labels[0] == labels[1] != labels[2]
+    # Nama sama, harga naik 25% per langkah: tiap kelompok tetap dalam 30% dari harga leader-nya
+    prices = pd.Series([100 * 1.25 ** step for step in range(8)])
+    labels = cluster_labels(["kaos polos hitam pria cotton"] * len(prices), prices)
+    ranges = prices.groupby(labels).agg(["min", "max"])
+    assert len(ranges) > 1
+    assert (ranges["max"] / ranges["min"] <= 1.3).all()
+
+
+def test_synthetic_catalog_does_not_collapse():
+    catalog = _Catalog(random.Random(0), 20000)
+    items = [catalog.item(index) for index in range(20000)]
+    labels = cluster_labels([item["name"] for item in items], [item["price"] / 100000 for item in items])
+    # Semua item katalog berbeda; dulu rantai tautan menggabungkan hampir semuanya
+    assert np.bincount(labels).max() < 100
+    assert labels.max() + 1 > len(items) // 5
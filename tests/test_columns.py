@@ -0,0 +1,58 @@
+import pandas as pd
+
+from shopee_har.columns import ColumnBuffer, concat_frames, drop_duplicate_items
+
+
+def _fields(itemid, shopid, price, name="Kaos Polos"):
+    return {
+        "itemid": itemid, "shopid": shopid, "price": price * 100000, "monthly_sold": 5, "historical_sold": 50,
+        "rating_star": 4.8, "rating_count": [10], "shop_rating": 4.9, "ctime": 1700000000, "is_sold_out": False,
+        "name": name, "shop_name": "Toko A", "shop_location": "Jakarta",
+    }
+
+
+# (fields, source, startedDateTime); item (1, 10) muncul tiga kali, yang terbaru harganya 300
+CAPTURES = [
+    (_fields(10, 1, 100), "search", "2025-04-19T08:00:00Z"),
+    (_fields(11, 1, 150), "search", "2025-04-19T08:00:00Z"),
+    (_fields(10, 1, 300), "shop", "2025-04-19T09:00:00Z"),
+    (_fields(None, None, 50, "Tanpa id"), "search", "2025-04-19T09:00:00Z"),
+    (_fields(10, 1, 200), "recommend", "2025-04-19T08:30:00Z"),
+    (_fields(None, None, 60, "Tanpa id"), "shop", "2025-04-19T09:30:00Z"),
+]
+
+
+def _buffer(captures):
+    buffer = ColumnBuffer(dedup=True)
+    for fields, source, started in captures:
+        buffer.append(fields, source, started)
+    return buffer
+
+
+def test_buffer_keeps_latest_capture_and_all_sources():
+    frame = _buffer(CAPTURES).to_frame()
+    assert list(frame["price"]) == [300, 150, 50, 60]
+    item = frame.iloc[0]
+    assert (item["itemid"], item["source"], item["sources"]) == (10, "shop", "recommend, search, shop")
+    # Baris tanpa id tidak digabung
+    assert frame["itemid"].isna().sum() == 2
+
+
+def test_extend_and_drop_duplicate_items_match_one_buffer():
+    expected = _buffer(CAPTURES).to_frame()
+
+    merged = ColumnBuffer(dedup=True)
+    for part in (CAPTURES[:2], CAPTURES[2:4], CAPTURES[4:]):
+        merged.extend(_buffer(part))
+    pd.testing.assert_frame_equal(merged.to_frame(), expected)
+
+    frames = [_buffer(part).to_frame() for part in (CAPTURES[:3], CAPTURES[3:])]
+    result = drop_duplicate_items(concat_frames(frames)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_categorical=False)
+
+
+def test_drop_duplicate_items_prefers_later_row_on_equal_time():
+    frames = [_buffer([(_fields(10, 1, price), source, "2025-04-19T08:00:00Z")]).to_frame() for price, source in ((100, "search"), (200, "shop"))]
+    result = drop_duplicate_items(concat_frames(frames))
+    assert list(result["price"]) == [200]
+    assert result["sources"].iloc[0] == "search, shop"
@@ -0,0 +1,49 @@
+import json
+
+import pandas as pd
+import pytest
+
+from shopee_har.entryindex import INDEX_VERSION, entry_index, extract_indexed_frame, load_entry_index
+from shopee_har.extract import extract_frame
+from shopee_har.reader import iter_raw_har_entries
+from shopee_har.synthetic import write_har
+
+
+@pytest.fixture(scope="module")
+def har_document(tmp_path_factory):
+    path = tmp_path_factory.mktemp("har") / "synthetic.har"
+    write_har(str(path), 256 * 1024, seed=1)
+    with open(path, encoding="utf-8") as fileobj:
+        return json.load(fileobj)
+
+
+# Generator sintetis menulis entri dengan "," saja; HAR dari browser ber-indentasi
+@pytest.mark.parametrize("dump", [
+    lambda document: json.dumps(document, indent=2),
+    lambda document: json.dumps(document),
+    lambda document: "\ufeff" + json.dumps(document, indent="\t"),
+], ids=["indented", "compact", "bom-tabs"])
+def test_offsets_and_indexed_extraction(tmp_path, har_document, dump):
+    path = tmp_path / "capture.har"
+    path.write_bytes(dump(har_document).encode("utf-8"))
+    data = path.read_bytes()
+    spans = list(iter_raw_har_entries(str(path), chunk_size=4096, offsets=True))
+    assert len(spans) == len(har_document["log"]["entries"])
+    for offset, raw in spans:
+        assert data[offset:offset + len(raw)] == raw
+
+    expected = extract_frame(str(path))
+    pd.testing.assert_frame_equal(extract_indexed_frame(str(path)), expected)
+    # Kedua kali lewat index yang sudah tersimpan
+    assert load_entry_index(str(path))["version"] == INDEX_VERSION
+    pd.testing.assert_frame_equal(extract_indexed_frame(str(path)), expected)
+
+
+def test_outdated_index_is_rebuilt(tmp_path, har_document):
+    path = tmp_path / "capture.har"
+    path.write_text(json.dumps(har_document, indent=2), encoding="utf-8")
+    index = entry_index(str(path))
+    index["version"] = INDEX_VERSION - 1
+    (tmp_path / "capture.har.idx").write_text(json.dumps(index), encoding="utf-8")
+    assert load_entry_index(str(path)) is None
+    pd.testing.assert_frame_equal(extract_indexed_frame(str(path)), extract_frame(str(path)))
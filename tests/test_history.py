@@ -0,0 +1,55 @@
+import pytest
+
+from shopee_har.columns import ColumnBuffer
+from shopee_har.history import SnapshotStore
+
+
+def _frame(*captures):
+    buffer = ColumnBuffer(dedup=True)
+    for itemid, price, historical_sold, started in captures:
+        buffer.append({
+            "itemid": itemid, "shopid": 1, "price": price * 100000, "monthly_sold": 5, "historical_sold": historical_sold,
+            "rating_star": 4.8, "rating_count": 10, "shop_rating": 4.9, "ctime": 1700000000, "is_sold_out": False,
+            "name": f"Barang {itemid}", "shop_name": "Toko A", "shop_location": "Jakarta",
+        }, "search", started)
+    return buffer.to_frame()
+
+
+@pytest.fixture
+def store():
+    store = SnapshotStore(":memory:")
+    yield store
+    store.close()
+
+
+def test_upsert_keeps_latest_capture_per_day(store):
+    assert store.add_frame(_frame((10, 100, 50, "2025-04-19T08:00:00"), (11, 200, 5, "2025-04-19T08:00:00")), "a", "a.har") == 2
+    # HAR yang sama tidak ditulis dua kali
+    assert store.has_file("a") and not store.has_file("b")
+    assert store.add_frame(_frame((10, 999, 999, "2025-04-19T23:00:00")), "a", "a.har") == 0
+
+    # Capture yang lebih lama di hari yang sama tidak mengganti, yang lebih baru mengganti
+    assert store.add_frame(_frame((10, 90, 40, "2025-04-19T07:00:00")), "b") == 0
+    assert store.add_frame(_frame((10, 110, 60, "2025-04-19T09:00:00")), "c") == 1
+    history = store.item_history(10)
+    assert len(history) == 1
+    assert (history["price"].iloc[0], history["historical_sold"].iloc[0]) == (110, 60)
+
+    assert store.add_frame(None, "d") == 0
+    assert store.has_file("d")
+
+
+def test_snapshots_per_day_and_sales_velocity(store):
+    store.add_frame(_frame((10, 100, 50, "2025-04-19T08:00:00"), (11, 200, 5, "2025-04-19T08:00:00")), "a")
+    store.add_frame(_frame((10, 100, 80, "2025-04-21T08:00:00")), "b")
+    store.add_frame(_frame((10, 100, 90, "2025-04-25T08:00:00"), (11, 200, 5, "2025-04-22T08:00:00")), "c")
+    assert list(store.item_history(10, shopid=1)["historical_sold"]) == [50, 80, 90]
+    assert len(store.shop_history(shop_name="Toko A")) == 5
+
+    velocity = store.sales_velocity()
+    assert list(velocity["itemid"]) == [10, 11]
+    assert velocity["sold_per_day"].tolist() == pytest.approx([40 / 6, 0])
+    window = store.sales_velocity(start="2025-04-20", end="2025-04-21")
+    assert window.empty
+    window = store.sales_velocity(start="2025-04-20")
+    assert window["sold_delta"].tolist() == [10]
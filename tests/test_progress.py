@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from shopee_har.background import ExtractionJob
+from shopee_har.extract import extract_har
+from shopee_har.parallel import extract_har_parallel
+from shopee_har.progress import ExtractionCancelled, Progress, track_progress
+from shopee_har.synthetic import write_har
+
+# Entri sintetis besar; progres dipublikasikan tiap 8 entri agar satu file kecil cukup
+PUBLISH_ENTRIES = 8
+
+
+@pytest.fixture(scope="module")
+def har():
+    file = io.BytesIO()
+    stats = write_har(file, 1024 * 1024)
+    assert stats["entries"] > 2 * PUBLISH_ENTRIES
+    return file.getvalue(), stats
+
+
+@pytest.fixture(autouse=True)
+def publish_often(monkeypatch):
+    monkeypatch.setattr("shopee_har.extract.PUBLISH_ENTRIES", PUBLISH_ENTRIES)
+
+
+def _items(stats):
+    return sum(value for key, value in stats.items() if key.startswith("items:"))
+
+
+def test_inline_and_split_extraction_publish_progress(har):
+    data, stats = har
+    with track_progress(Progress()) as progress:
+        extract_har(data)
+    assert (progress.entries, progress.items) == (stats["entries"], _items(stats))
+
+    with track_progress(Progress()) as progress:
+        extract_har_parallel(io.BytesIO(data), max_workers=2, chunk_bytes=64 * 1024)
+    assert (progress.entries, progress.items) == (stats["entries"], _items(stats))
+
+
+def test_cancel_stops_inside_a_file(har):
+    data, _ = har
+    progress = Progress()
+    progress.cancel()
+    with track_progress(progress), pytest.raises(ExtractionCancelled):
+        extract_har(data)
+    assert progress.entries == PUBLISH_ENTRIES
+    with track_progress(progress), pytest.raises(ExtractionCancelled):
+        extract_har_parallel(io.BytesIO(data), max_workers=2, chunk_bytes=64 * 1024)
+
+
+def test_job_reports_entries_of_a_single_file(har):
+    data, stats = har
+    job = ExtractionJob([io.BytesIO(data)], max_workers=1)
+    job.wait()
+    progress = job.progress()
+    assert progress["files_done"] == 1 and progress["entries"] == stats["entries"]
+    assert progress["items"] == _items(stats)
@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+from shopee_har.reader import iter_har_entries, iter_raw_har_entries
+from shopee_har.synthetic import write_har
+
+# Isi yang menjebak pemindai: kutip, backslash dan kurung di dalam string, unicode, skalar
+TRICKY_ENTRIES = [
+    {"request": {"url": "https://shopee.co.id/api/v4/search?q=\"kaos\"&x=\\"}, "response": {"content": {"text": "{\"a\": [1, \"]}\"]}"}}},
+    {"startedDateTime": "2025-04-19T08:00:00.000Z", "time": 12.5, "cache": {}, "timings": {"wait": -1}, "comment": "\\\\\"}{]["},
+    {"name": "Kaos Polos – Hitam 🖤 ñ", "flags": [True, False, None], "nested": [[[]], [{}], {"x": [{"y": "]"}]}]},
+    {},
+    [],
+    "teks",
+    -1.5e3,
+    None,
+]
+
+DOCUMENTS = {
+    "compact": lambda entries: json.dumps({"log": {"version": "1.2", "entries": entries}}),
+    "indented": lambda entries: json.dumps({"log": {"version": "1.2", "entries": entries}}, indent=2, ensure_ascii=False),
+    # Kunci lain sebelum dan sesudah log/entries, termasuk string dan array yang harus dilewati
+    "keys-around": lambda entries: json.dumps({
+        "meta": {"entries": ["bukan ini"], "s": "}]\"{["}, "n": 3, "t": True, "z": None,
+        "log": {"pages": [{"id": "page_1"}], "creator": {"name": "x"}, "entries": entries, "after": [1, 2]},
+        "tail": "\\",
+    }, ensure_ascii=False),
+    "whitespace": lambda entries: " \r\n\t" + json.dumps({"log": {"entries": entries}}, separators=(" , ", " : ")) + "\n\n",
+    "bom": lambda entries: "﻿" + json.dumps({"log": {"entries": entries}}),
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+def test_entries_match_json_load_across_chunk_boundaries(name, chunk_size):
+    text = DOCUMENTS[name](TRICKY_ENTRIES)
+    data = text.encode("utf-8")
+    expected = json.loads(text.lstrip("﻿"))["log"]["entries"]
+    assert list(iter_har_entries(io.BytesIO(data), chunk_size)) == expected
+    assert list(iter_har_entries(io.StringIO(text), chunk_size)) == expected
+    assert [json.loads(raw) for raw in iter_raw_har_entries(io.BytesIO(data), chunk_size)] == expected
+
+
+def test_synthetic_har_matches_json_load(tmp_path):
+    path = tmp_path / "capture.har"
+    write_har(str(path), 300 * 1024, seed=2)
+    with open(path, encoding="utf-8") as fileobj:
+        expected = json.load(fileobj)["log"]["entries"]
+    for chunk_size in (4096, 1 << 20):
+        assert list(iter_har_entries(str(path), chunk_size)) == expected
+
+
+@pytest.mark.parametrize("text", ['{"log": {"entries": []}}', '{"log": {}}', "{}"])
+def test_documents_without_entries(text):
+    assert list(iter_har_entries(io.BytesIO(text.encode()))) == []
+
+
+@pytest.mark.parametrize("text", ['{"log": {"entries": [{"a": 1}', '{"log": {"entries": [{"a": "x}]}', '{"log": {"entries": [1 2]}}'])
+def test_truncated_or_malformed_documents_raise(text):
+    with pytest.raises(ValueError):
+        list(iter_har_entries(io.BytesIO(text.encode()), chunk_size=4))
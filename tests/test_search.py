@@ -0,0 +1,62 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shopee_har.search import SearchIndex, TextIndex, normalize_text
+from shopee_har.synthetic import _Catalog
+
+
+@pytest.fixture(scope="module")
+def frame():
+    catalog = _Catalog(random.Random(0), 3000)
+    items = [catalog.item(index) for index in range(3000)]
+    return pd.DataFrame({
+        "item_name": [item["name"] for item in items] + [None, "  KAOS   Polos Zzqx "],
+        "shop_name": [item["shop_name"] for item in items] + ["Toko A", None],
+    })
+
+
+def _contains(series, query):
+    # Acuan: tiap kata query harus ada (tanpa beda huruf besar/kecil dan spasi) di nilai kolom
+    normalized = series.map(normalize_text)
+    mask = pd.Series(True, index=series.index)
+    for term in normalize_text(query).split():
+        mask &= normalized.str.contains(term, regex=False)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def _queries(frame):
+    rng = random.Random(1)
+    words = " ".join(frame["item_name"].dropna().iloc[:200]).split()
+    queries = [rng.choice(words) for _ in range(20)]
+    queries += [rng.choice(words)[:2] for _ in range(5)]
+    queries += [f"{rng.choice(words)} {rng.choice(words)[1:4]}" for _ in range(10)]
+    return queries + ["kaos polos", "  KAOS ", "zzqx polos", "zzzq", "ka", "a"]
+
+
+def test_text_index_matches_str_contains(frame):
+    index = TextIndex(frame["item_name"])
+    for query in _queries(frame):
+        np.testing.assert_array_equal(index.search(query), _contains(frame["item_name"], query), err_msg=query)
+    np.testing.assert_array_equal(index.search("   "), np.arange(len(frame)))
+    assert index.suggestions("ZZQX kaos") == ["kaos polos zzqx"]
+
+
+def test_filter_rows_intersects_columns_and_values(frame):
+    index = SearchIndex(frame)
+    assert index.filter_rows() is None
+    assert index.filter_rows({"item_name": " "}, {"shop_name": []}) is None
+
+    item_query = frame["item_name"].iloc[0].split()[0]
+    shop_query = frame["shop_name"].iloc[0][:4]
+    rows = index.filter_rows({"item_name": item_query, "shop_name": shop_query})
+    expected = np.intersect1d(_contains(frame["item_name"], item_query), _contains(frame["shop_name"], shop_query))
+    np.testing.assert_array_equal(rows, expected)
+    assert 0 in rows
+
+    shops = list(frame["shop_name"].dropna().unique()[:3])
+    rows = index.filter_rows({"item_name": item_query}, {"shop_name": shops})
+    expected = np.intersect1d(_contains(frame["item_name"], item_query), np.flatnonzero(frame["shop_name"].isin(shops)))
+    np.testing.assert_array_equal(rows, expected)
@@ -0,0 +1,10 @@
+from collections import Counter
+
+from shopee_har.shapes import FLAT, ITEM_BASIC, ITEM_CARD
+
+
+def test_is_sold_out_is_read_from_every_shape():
+    stats = Counter()
+    assert FLAT.accessor({"itemid": 1, "is_sold_out": True}, stats)["is_sold_out"] is True
+    assert ITEM_BASIC.accessor({"item_basic": {"itemid": 1, "is_sold_out": True}}, stats)["is_sold_out"] is True
+    assert ITEM_CARD.accessor({"itemid": 1, "is_sold_out": False}, stats)["is_sold_out"] is False
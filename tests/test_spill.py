@@ -0,0 +1,31 @@
+import io
+
+import pandas as pd
+
+from shopee_har.columns import concat_frames, drop_duplicate_items
+from shopee_har.extract import extract_frame
+from shopee_har.spill import PartitionStore
+from shopee_har.synthetic import write_har
+
+
+def _frames():
+    frames = []
+    for seed in (0, 1, 0, 1):
+        file = io.BytesIO()
+        write_har(file, 600 * 1024, seed=seed)
+        frames.append(extract_frame(file.getvalue()))
+    return frames
+
+
+def test_dedup_matches_in_memory_rows_and_order(tmp_path):
+    frames = _frames()
+    expected = drop_duplicate_items(concat_frames(frames)).reset_index(drop=True)
+    with PartitionStore(str(tmp_path / "spill"), memory_budget=64 * 1024, buckets=4) as store:
+        for frame in frames:
+            store.add(frame)
+        assert store.spills > 1
+        result = concat_frames(list(store.iter_frames()))
+        assert store.splits
+        unordered = concat_frames(list(store.iter_frames(ordered=False)))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+    assert sorted(unordered["itemid"]) == sorted(expected["itemid"])
@@ -0,0 +1,25 @@
+import os
+import shutil
+
+from shopee_har.history import SnapshotStore
+from shopee_har.synthetic import write_har
+from shopee_har.watch import Watcher
+
+
+def test_files_are_ingested_once_across_extractor_versions(tmp_path, monkeypatch):
+    directory = tmp_path / "har"
+    directory.mkdir()
+    write_har(str(directory / "a.har"), 200 * 1024)
+    store = SnapshotStore(":memory:")
+    watcher = Watcher(str(directory), store, max_workers=1, settle=0)
+    watcher.run(interval=0, once=True)
+    assert watcher.totals["files_ingested"] == 1
+
+    # Versi extractor naik: salinan file yang sama tetap dianggap sudah masuk
+    monkeypatch.setattr("shopee_har.cache.EXTRACTOR_VERSION", "test")
+    shutil.copy(directory / "a.har", directory / "b.har")
+    os.utime(directory / "a.har")
+    watcher.run(interval=0, once=True)
+    assert watcher.totals["files_ingested"] == 1
+    assert watcher.totals["files_skipped"] == 2
+    store.close()